@@ -64,8 +64,8 @@ class TRTInferencer(Inferencer):
                 if TRT_DYNAMIC_DIM in shape:
                     shape = override_shape(shape, self.max_batch_size)
                     self.execute_v2 = True
-                self.context.set_binding_shape(binding_idx, shape)
-                self._input_shape = shape
+                self._input_shape = tuple(shape)
+                self.context.set_binding_shape(binding_idx, self._input_shape)
                 if data_format == "channels_first":
                     self._img_height, self._img_width = self._input_shape[2:4]
                     self._nchannels = self._input_shape[1]
@@ -83,7 +83,7 @@ class TRTInferencer(Inferencer):
             self.trt_engine,
             self.context)
 
-        input_volume = trt.volume(self._input_shape)
+        input_volume = trt.volume(self._input_shape[1:])
         self.numpy_array = np.zeros((self.max_batch_size, input_volume))
         self.img_mean = img_mean
         self.keep_aspect_ratio = keep_aspect_ratio
@@ -91,6 +91,16 @@ class TRTInferencer(Inferencer):
         self.img_depth = img_depth
         assert self.img_depth in [8, 16], "Only 8-bit and 16-bit images are supported"
 
+    @property
+    def input_hwc(self):
+        """Input height, width and number of channels of the engine."""
+        return self._img_height, self._img_width, self._nchannels
+
+    @property
+    def output_volume(self):
+        """Number of output values per image, i.e. the number of classes."""
+        return self.outputs[0].host.size // self.max_batch_size
+
     def clear_buffers(self):
         """Simple function to free input, output buffers allocated earlier.
 
@@ -163,6 +173,28 @@ class TRTInferencer(Inferencer):
         # ...and return results up to the actual batch size.
         return results
 
+    def infer_batch(self, imgs):
+        """Infers model on a batch of preprocessed images.
+
+        Args:
+            imgs (np.ndarray): batch of preprocessed images in the engine input layout.
+
+        Returns:
+            np.ndarray: model outputs of shape (batch_size, output_volume).
+        """
+        actual_batch_size = len(imgs)
+        if actual_batch_size > self.max_batch_size:
+            raise ValueError(
+                f"image batch bigger ({actual_batch_size}) than engine max batch size ({self.max_batch_size})")
+        self.numpy_array[:actual_batch_size] = imgs.reshape(actual_batch_size, -1)
+        np.copyto(self.inputs[0].host, self.numpy_array.ravel())
+        results = do_inference(
+            self.context, bindings=self.bindings, inputs=self.inputs,
+            outputs=self.outputs, stream=self.stream,
+            batch_size=self.max_batch_size,
+            execute_v2=self.execute_v2)
+        return results[0].reshape(self.max_batch_size, -1)[:actual_batch_size].copy()
+
     def __del__(self):
         """Clear things up on object deletion."""
         self.clear_trt_session()
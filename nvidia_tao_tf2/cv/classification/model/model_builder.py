@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from functools import partial
+
 from tensorflow.keras.layers import AveragePooling2D, Dense, Flatten
 from tensorflow.keras.layers import Activation, Input
 from tensorflow.keras.models import Model
@@ -128,287 +130,8 @@ def get_byom(model_config_path=None,
     return final_model
 
 
-def get_efficientnet_b0(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B0 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB0(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b1(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B1 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB1(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b2(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B2 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB2(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b3(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B3 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB3(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b4(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B4 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB4(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b5(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B5 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB5(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b6(
-    input_shape=None,
-    data_format='channels_first',
-    nclasses=1000,
-    use_bias=False,
-    kernel_regularizer=None,
-    bias_regularizer=None,
-    retain_head=False,
-    freeze_bn=False,
-    freeze_blocks=None,
-    stride16=False,
-    activation_type=None,
-    input_name="Input"
-):
-    """Get an EfficientNet B6 model."""
-    input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB6(
-        input_tensor=input_image,
-        input_shape=input_shape,
-        add_head=retain_head,
-        data_format=data_format,
-        use_bias=use_bias,
-        kernel_regularizer=kernel_regularizer,
-        bias_regularizer=bias_regularizer,
-        classes=nclasses,
-        freeze_bn=freeze_bn,
-        freeze_blocks=freeze_blocks,
-        stride16=stride16,
-        activation_type=activation_type
-    )
-    if not retain_head:
-        final_model = add_dense_head(nclasses,
-                                     final_model,
-                                     data_format,
-                                     kernel_regularizer,
-                                     bias_regularizer)
-
-    return final_model
-
-
-def get_efficientnet_b7(
+def get_efficientnet(
+    model_class,
     input_shape=None,
     data_format='channels_first',
     nclasses=1000,
@@ -422,9 +145,9 @@ def get_efficientnet_b7(
     activation_type=None,
     input_name="Input"
 ):
-    """Get an EfficientNet B7 model."""
+    """Get an EfficientNet model of the given variant class, e.g. EfficientNetB0."""
     input_image = Input(shape=input_shape, name=input_name)
-    final_model = EfficientNetB7(
+    final_model = model_class(
         input_tensor=input_image,
         input_shape=input_shape,
         add_head=retain_head,
@@ -525,17 +248,14 @@ def get_mobilenet_v2(input_shape=None,
 
 # defining model dictionary
 model_choose = {"resnet": get_resnet,
-                "efficientnet-b0": get_efficientnet_b0,
-                "efficientnet-b1": get_efficientnet_b1,
-                "efficientnet-b2": get_efficientnet_b2,
-                "efficientnet-b3": get_efficientnet_b3,
-                "efficientnet-b4": get_efficientnet_b4,
-                "efficientnet-b5": get_efficientnet_b5,
-                "efficientnet-b6": get_efficientnet_b6,
-                "efficientnet-b7": get_efficientnet_b7,
                 "mobilenet_v1": get_mobilenet,
                 "mobilenet_v2": get_mobilenet_v2,
                 "byom": get_byom}
+model_choose.update({
+    f"efficientnet-b{i}": partial(get_efficientnet, model_class)
+    for i, model_class in enumerate([EfficientNetB0, EfficientNetB1, EfficientNetB2, EfficientNetB3,
+                                     EfficientNetB4, EfficientNetB5, EfficientNetB6, EfficientNetB7])
+})
 
 
 def get_model(backbone="resnet_18",
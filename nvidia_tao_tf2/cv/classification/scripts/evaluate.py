@@ -20,9 +20,6 @@ import sys
 
 import numpy as np
 from PIL import ImageFile
-from sklearn.metrics import classification_report, confusion_matrix
-import tensorflow as tf
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
 
 from nvidia_tao_core.config.classification_tf2.default_config import ExperimentConfig
 
@@ -31,14 +28,51 @@ import nvidia_tao_tf2.common.logging.logging as status_logging
 from nvidia_tao_tf2.common.decorators import monitor_status
 from nvidia_tao_tf2.common.utils import update_results_dir
 
-from nvidia_tao_tf2.cv.classification.utils import preprocess_crop  # noqa pylint: disable=unused-import
+from nvidia_tao_tf2.cv.classification.utils.dataset_utils import (
+    build_cached_eval_dataset,
+    build_eval_dataset,
+    list_image_directory,
+    load_eval_cache
+)
 from nvidia_tao_tf2.cv.classification.utils.preprocess_input import preprocess_input
-from nvidia_tao_tf2.cv.classification.utils.helper import get_input_shape, load_model
+from nvidia_tao_tf2.cv.classification.utils.helper import (
+    confusion_matrix_and_scores,
+    format_classification_report,
+    get_input_shape,
+    load_model
+)
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 logging.basicConfig(format='%(asctime)s [%(levelname)s] %(name)s: %(message)s', level='INFO')
 logger = logging.getLogger(__name__)
 
 
+def categorical_crossentropy(y_true, y_prob, epsilon=1e-7):
+    """Compute the mean categorical crossentropy from sparse labels and class probabilities.
+
+    Matches `tf.keras.losses.categorical_crossentropy` with `from_logits=False`.
+
+    Args:
+        y_true (np.ndarray): ground truth class indices of shape (N,).
+        y_prob (np.ndarray): predicted class probabilities of shape (N, C).
+        epsilon (float): clipping value used to avoid log(0).
+    """
+    y_prob = y_prob / np.sum(y_prob, axis=-1, keepdims=True)
+    y_prob = np.clip(y_prob, epsilon, 1. - epsilon)
+    return float(-np.mean(np.log(y_prob[np.arange(len(y_true)), y_true])))
+
+
+def top_k_accuracy(y_true, y_prob, k=5):
+    """Compute the top-k accuracy from sparse labels and class probabilities.
+
+    Args:
+        y_true (np.ndarray): ground truth class indices of shape (N,).
+        y_prob (np.ndarray): predicted class probabilities of shape (N, C).
+        k (int): number of top predictions to consider.
+    """
+    top_k_pred = np.argsort(-y_prob, axis=1)[:, :k]
+    return float(np.mean(np.any(top_k_pred == y_true[:, None], axis=1)))
+
+
 @monitor_status(name='classification', mode='evaluation')
 def run_evaluate(cfg):
     """Wrapper function to run evaluation of classification model.
@@ -55,28 +89,30 @@ def run_evaluate(cfg):
 
     if not os.path.exists(cfg.results_dir):
         os.makedirs(cfg.results_dir, exist_ok=True)
-    # Decrypt EFF
-    final_model = load_model(
-        str(cfg.evaluate.checkpoint),
-        cfg.encryption_key)
-
-    # Defining optimizer
-    opt = tf.keras.optimizers.legacy.SGD(lr=0, decay=1e-6, momentum=0.9, nesterov=False)
-    # Define precision/recall and F score metrics
-    topk_acc = partial(tf.keras.metrics.top_k_categorical_accuracy,
-                       k=cfg['evaluate']['top_k'])
-    topk_acc.__name__ = 'topk_acc'
-    # Compile model
-    final_model.compile(loss='categorical_crossentropy',
-                        metrics=[topk_acc],
-                        optimizer=opt)
-
-    # print model summary
-    final_model.summary()
-
-    # Get input shape
-    image_height, image_width, nchannels = get_input_shape(final_model, cfg.data_format)
     image_depth = cfg['model']['input_image_depth']
+    use_engine = str(cfg.evaluate.checkpoint).endswith('.engine')
+    if use_engine:
+        # Evaluate with a (FP16/INT8) TensorRT engine
+        from nvidia_tao_tf2.cv.classification.inferencer.trt_inferencer import TRTInferencer  # noqa pylint: disable=C0415
+        final_model = TRTInferencer(
+            str(cfg.evaluate.checkpoint),
+            batch_size=cfg['evaluate']['batch_size'],
+            data_format=cfg.data_format,
+            img_depth=image_depth)
+        image_height, image_width, nchannels = final_model.input_hwc
+        model_nclasses = final_model.output_volume
+    else:
+        # Decrypt EFF
+        final_model = load_model(
+            str(cfg.evaluate.checkpoint),
+            cfg.encryption_key)
+
+        # print model summary
+        final_model.summary()
+
+        # Get input shape
+        image_height, image_width, nchannels = get_input_shape(final_model, cfg.data_format)
+        model_nclasses = final_model.output.get_shape().as_list()[-1]
     assert image_depth in [8, 16], "Only 8-bit and 16-bit images are supported"
 
     assert nchannels in [1, 3], (
@@ -90,16 +126,12 @@ def run_evaluate(cfg):
     if cfg.dataset.augmentation.enable_center_crop:
         interpolation += ":center"
 
-    # Initializing data generator
-    target_datagen = ImageDataGenerator(
-        preprocessing_function=partial(preprocess_input,
-                                       data_format=cfg.data_format,
-                                       mode=cfg.dataset.preprocess_mode,
-                                       img_mean=list(cfg.dataset.image_mean),
-                                       color_mode=color_mode,
-                                       img_depth=image_depth),
-        horizontal_flip=False,
-        data_format=cfg['data_format'])
+    preprocessing_function = partial(preprocess_input,
+                                     data_format=cfg.data_format,
+                                     mode=cfg.dataset.preprocess_mode,
+                                     img_mean=list(cfg.dataset.image_mean),
+                                     color_mode=color_mode,
+                                     img_depth=image_depth)
 
     if cfg.evaluate.classmap:
         # If classmap is provided, then we explicitly set it in ImageDataGenerator
@@ -129,54 +161,71 @@ def run_evaluate(cfg):
     else:
         class_names = None
 
-    # Initializing data iterator
-    target_iterator = target_datagen.flow_from_directory(
-        cfg['evaluate']['dataset_path'],
-        target_size=(image_height, image_width),
-        color_mode=color_mode,
-        batch_size=cfg['evaluate']['batch_size'],
-        class_mode='categorical',
-        interpolation=interpolation,
-        shuffle=False)
+    # Initializing data pipeline
+    # Use the pre-resized TFRecord cache from precompute_eval_cache if it is up to date.
+    cache_meta = load_eval_cache(cfg['evaluate']['dataset_path'], image_height, image_width,
+                                 nchannels, color_mode, interpolation, image_depth)
+    if cache_meta is not None:
+        logger.info('Using pre-resized image cache for evaluation.')
+        y_true = np.array(cache_meta['classes'], dtype=np.int32)
+        class_dict = cache_meta['class_indices']
+        build_dataset = partial(
+            build_cached_eval_dataset,
+            cfg['evaluate']['dataset_path'],
+            cache_meta,
+            data_format=cfg.data_format,
+            preprocessing_function=preprocessing_function,
+            num_parallel_calls=cfg['evaluate']['n_workers'])
+    else:
+        filepaths, y_true, class_dict = list_image_directory(cfg['evaluate']['dataset_path'])
+        build_dataset = partial(
+            build_eval_dataset,
+            filepaths,
+            image_height=image_height,
+            image_width=image_width,
+            nchannels=nchannels,
+            color_mode=color_mode,
+            interpolation=interpolation,
+            data_format=cfg.data_format,
+            preprocessing_function=preprocessing_function,
+            num_parallel_calls=cfg['evaluate']['n_workers'])
 
     logger.info('Processing dataset (evaluation): {}'.format(cfg['evaluate']['dataset_path']))  # noqa pylint: disable=C0209
-    nclasses = target_iterator.num_classes
+    logger.info('Found %d images belonging to %d classes.', len(y_true), len(class_dict))
+    nclasses = len(class_dict)
     assert nclasses > 1, "Invalid number of classes in the evaluation dataset."
 
     # If number of classes does not match the new data
-    assert nclasses == final_model.output.get_shape().as_list()[-1], \
+    assert nclasses == model_nclasses, \
         "The number of classes of the loaded model doesn't match the \
          number of classes in the evaluation dataset."
 
-    # Evaluate the model on the full data set.
-    score = final_model.evaluate(target_iterator,
-                                 steps=len(target_iterator),
-                                 workers=cfg['evaluate']['n_workers'],
-                                 use_multiprocessing=False)
-
-    logger.info('Evaluation Loss: %s', score[0])
-    logger.info('Evaluation Top %s accuracy: %s', cfg['evaluate']['top_k'], score[1])
-    status_logging.get_status_logger().kpi['loss'] = float(score[0])
-    status_logging.get_status_logger().kpi['top_k'] = float(score[1])
-    # Re-initializing data iterator
-    target_iterator = target_datagen.flow_from_directory(
-        cfg['evaluate']['dataset_path'],
-        target_size=(image_height, image_width),
-        batch_size=cfg['evaluate']['batch_size'],
-        color_mode=color_mode,
-        class_mode='categorical',
-        interpolation=interpolation,
-        shuffle=False)
-    logger.info("Calculating per-class P/R and confusion matrix. It may take a while...")
-    Y_pred = final_model.predict_generator(target_iterator, len(target_iterator), workers=1)
+    # Run inference once over the full data set and derive all metrics from it.
+    logger.info("Calculating loss, top-k accuracy, per-class P/R and confusion matrix. It may take a while...")
+    target_dataset = build_dataset(batch_size=cfg['evaluate']['batch_size'])
+    if use_engine:
+        Y_pred = np.concatenate(
+            [final_model.infer_batch(batch.numpy()) for batch in target_dataset])
+    else:
+        Y_pred = final_model.predict(target_dataset)
+    loss = categorical_crossentropy(y_true, Y_pred)
+    if not use_engine:
+        # Like Model.evaluate, include the kernel regularization losses kept in the model.
+        loss += float(sum(final_model.losses))
+    top_k = top_k_accuracy(y_true, Y_pred, k=cfg['evaluate']['top_k'])
+
+    logger.info('Evaluation Loss: %s', loss)
+    logger.info('Evaluation Top %s accuracy: %s', cfg['evaluate']['top_k'], top_k)
+    status_logging.get_status_logger().kpi['loss'] = float(loss)
+    status_logging.get_status_logger().kpi['top_k'] = float(top_k)
+
     y_pred = np.argmax(Y_pred, axis=1)
+    cm, precision, recall, f1, support = confusion_matrix_and_scores(y_true, y_pred, nclasses)
     print('Confusion Matrix')
-    print(confusion_matrix(target_iterator.classes, y_pred))
+    print(cm)
     print('Classification Report')
-    class_dict = target_iterator.class_indices
-    target_keys_names = list(sorted(class_dict.items(), key=lambda x: x[1]))
-    target_keys_names = list(zip(*target_keys_names))
-    print(classification_report(target_iterator.classes, y_pred, labels=target_keys_names[1], target_names=target_keys_names[0]))
+    target_names, _ = zip(*sorted(class_dict.items(), key=lambda kv: kv[1]))
+    print(format_classification_report(target_names, precision, recall, f1, support))
 
 
 spec_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,66 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pre-resize the evaluation images into a TFRecord cache used by evaluate."""
+import os
+import logging
+
+from nvidia_tao_core.config.classification_tf2.default_config import ExperimentConfig
+
+from nvidia_tao_tf2.common.hydra.hydra_runner import hydra_runner
+from nvidia_tao_tf2.common.decorators import monitor_status
+from nvidia_tao_tf2.common.utils import update_results_dir
+
+from nvidia_tao_tf2.cv.classification.utils.dataset_utils import write_eval_cache
+logging.basicConfig(format='%(asctime)s [%(levelname)s] %(name)s: %(message)s', level='INFO')
+logger = logging.getLogger(__name__)
+
+
+@monitor_status(name='classification', mode='evaluation cache')
+def run_precompute_eval_cache(cfg):
+    """Decode and resize `evaluate.dataset_path` once to the model input size.
+
+    Args:
+        cfg: Hydra config.
+    """
+    logger.setLevel(logging.INFO)
+    color_mode = "rgb" if cfg.model.input_channels == 3 else "grayscale"
+    interpolation = cfg.model.resize_interpolation_method
+    if cfg.dataset.augmentation.enable_center_crop:
+        interpolation += ":center"
+    cache_dir = write_eval_cache(
+        cfg.evaluate.dataset_path,
+        cfg.model.input_height,
+        cfg.model.input_width,
+        cfg.model.input_channels,
+        color_mode=color_mode,
+        interpolation=interpolation,
+        image_depth=cfg.model.input_image_depth)
+    logger.info('Evaluation cache is saved at: %s', cache_dir)
+
+
+spec_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@hydra_runner(
+    config_path=os.path.join(spec_root, "experiment_specs"),
+    config_name="eval", schema=ExperimentConfig
+)
+def main(cfg: ExperimentConfig) -> None:
+    """Wrapper function for building the classification evaluation cache."""
+    cfg = update_results_dir(cfg, 'evaluate')
+    run_precompute_eval_cache(cfg)
+
+
+if __name__ == '__main__':
+    main()
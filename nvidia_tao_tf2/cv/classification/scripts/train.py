@@ -19,6 +19,7 @@ import os
 import sys
 from functools import partial
 
+import cv2
 import tensorflow as tf
 from PIL import Image, ImageFile
 
@@ -68,6 +69,10 @@ def setup_env(cfg):
     seed = cfg.train.random_seed + hvd.rank()
     set_random_seed(seed)
     logger.debug("Random seed is set to %d", seed)
+    # OpenCV already splits color augmentation over image rows. Share the cores
+    # between the loader workers of all local ranks to avoid oversubscription.
+    cv2.setNumThreads(
+        max(1, (os.cpu_count() or 1) // (max(1, cfg.train.n_workers) * hvd.local_size())))
     # Create results dir
     if hvd.rank() == 0:
         if not os.path.exists(cfg.results_dir):
@@ -0,0 +1,120 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Classification helper tests."""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from nvidia_tao_tf2.cv.classification.utils import helper
+
+
+def _labels(nclasses, missing_pred=None, seed=0):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, nclasses, size=200)
+    y_pred = np.where(rng.random(200) < 0.6, y_true, rng.integers(0, nclasses, size=200))
+    if missing_pred is not None:
+        # the class is never predicted, so its precision is 0 / 0
+        y_pred[y_pred == missing_pred] = (missing_pred + 1) % nclasses
+    return y_true, y_pred
+
+
+@pytest.mark.parametrize("missing_pred", [None, 2])
+def test_confusion_matrix_and_scores(missing_pred):
+    metrics = pytest.importorskip("sklearn.metrics")
+    nclasses = 5
+    y_true, y_pred = _labels(nclasses, missing_pred)
+    cm, precision, recall, f1, support = helper.confusion_matrix_and_scores(y_true, y_pred, nclasses)
+    labels = list(range(nclasses))
+    assert np.array_equal(cm, metrics.confusion_matrix(y_true, y_pred, labels=labels))
+    expected = metrics.precision_recall_fscore_support(
+        y_true, y_pred, labels=labels, zero_division=0)
+    for result, reference in zip((precision, recall, f1, support), expected):
+        assert np.allclose(result, reference)
+
+
+@pytest.mark.parametrize("missing_pred", [None, 2])
+def test_format_classification_report(missing_pred):
+    metrics = pytest.importorskip("sklearn.metrics")
+    nclasses = 5
+    y_true, y_pred = _labels(nclasses, missing_pred)
+    target_names = ['cat', 'dog', 'horse', 'a_long_class_name', 'x']
+    _, precision, recall, f1, support = helper.confusion_matrix_and_scores(y_true, y_pred, nclasses)
+    report = helper.format_classification_report(target_names, precision, recall, f1, support)
+    assert report == metrics.classification_report(
+        y_true, y_pred, labels=list(range(nclasses)), target_names=target_names, zero_division=0)
+
+
+def test_color_augmentation():
+    img = np.random.default_rng(0).integers(0, 256, size=(32, 48, 3), dtype=np.uint8)
+    out = helper.color_augmentation(img, color_shift_stddev=0.1)
+    assert out.dtype == np.uint8
+    assert out.shape == img.shape
+    for aug in (helper.random_hue(img, 25.0), helper.random_saturation(img, 0.2),
+                helper.random_contrast(img, 0.5, 0.1), helper.random_shift(img, 0.1)):
+        assert aug.dtype == np.uint8
+        assert aug.shape == img.shape
+
+
+@pytest.mark.parametrize("shift", [-1.0, -0.2, 0.0, 0.05, 0.5])
+def test_shift_matches_float_path(shift):
+    img = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    expected = np.clip(img.astype(np.float64) + round(shift * 255.0), 0, 255)
+    assert np.array_equal(helper._shift(img, shift), expected)
+
+
+@pytest.mark.parametrize("center, scale", [(0.5, 0.9), (0.5, 1.1), (0.3, 1.5)])
+def test_contrast_matches_float_path(center, scale):
+    img = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    expected = np.clip(((img / 255.0 - center) * scale + center) * 255.0, 0, 255)
+    result = helper._contrast(img, center, scale)
+    assert result.dtype == np.uint8
+    assert np.abs(result - expected).max() <= 0.5 + 1e-6
+
+
+def test_get_rng_per_thread():
+    rngs = {}
+
+    def _draw(i):
+        rngs[i] = helper._get_rng()
+
+    threads = [threading.Thread(target=_draw, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert helper._get_rng() is helper._get_rng()
+    assert len({id(rng) for rng in rngs.values()} | {id(helper._get_rng())}) == 5
+    assert len({rng.uniform() for rng in rngs.values()}) == 4
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+def test_get_rng_after_fork():
+    np.random.seed(0)
+    helper._get_rng()
+    read_fd, write_fd = os.pipe()
+    draws = []
+    for _ in range(2):
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_fd, np.float64(helper._get_rng().uniform()).tobytes())
+            os._exit(0)  # noqa pylint: disable=W0212
+        os.waitpid(pid, 0)
+        draws.append(np.frombuffer(os.read(read_fd, 8), dtype=np.float64)[0])
+    os.close(read_fd)
+    os.close(write_fd)
+    # Both children inherit the same global NumPy state, but not the same stream.
+    assert draws[0] != draws[1]
@@ -0,0 +1,104 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""TRTInferencer host buffer tests, with the engine and CUDA calls replaced by numpy."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from nvidia_tao_tf2.cv.classification.inferencer import trt_inferencer
+
+NCLASSES = 4
+INPUT_SHAPE = (-1, 3, 8, 8)
+
+
+class FakeEngine:
+    """Engine with one dynamic batch input and one softmax output."""
+
+    def __init__(self):
+        self.max_batch_size = 1
+        self.shapes = {'input_1': INPUT_SHAPE, 'softmax_1': (-1, NCLASSES)}
+
+    def __iter__(self):
+        return iter(self.shapes)
+
+    def get_binding_index(self, binding):
+        return list(self.shapes).index(binding)
+
+    def get_binding_shape(self, binding_idx):
+        return list(self.shapes.values())[binding_idx]
+
+    def binding_is_input(self, binding_idx):
+        return binding_idx == 0
+
+    def create_execution_context(self):
+        return SimpleNamespace(set_binding_shape=lambda idx, shape: None)
+
+
+def fake_allocate_buffers(engine, context):
+    """Host buffers sized like engine.allocate_buffers for the resolved batch size."""
+    del engine, context
+    batch_size = fake_allocate_buffers.batch_size
+    device = SimpleNamespace(free=lambda: None)
+    inputs = [SimpleNamespace(host=np.zeros(batch_size * int(np.prod(INPUT_SHAPE[1:])), np.float32),
+                              device=device)]
+    outputs = [SimpleNamespace(host=np.zeros(batch_size * NCLASSES, np.float32), device=device)]
+    return inputs, outputs, [], None
+
+
+def fake_do_inference(context, bindings, inputs, outputs, stream, batch_size=1, execute_v2=False):
+    """Output c of image i is the sum of its input values plus c."""
+    del context, bindings, stream, execute_v2
+    sums = inputs[0].host.reshape(batch_size, -1).sum(axis=1)
+    outputs[0].host[:] = (sums[:, None] + np.arange(NCLASSES)).ravel()
+    return [out.host for out in outputs]
+
+
+@pytest.fixture
+def make_inferencer(monkeypatch):
+    """Build TRTInferencers on the fake engine for a given batch size."""
+    monkeypatch.setattr(trt_inferencer.trt, 'init_libnvinfer_plugins', lambda *args: None)
+    monkeypatch.setattr(trt_inferencer.trt, 'Runtime', lambda logger: None)
+    monkeypatch.setattr(trt_inferencer, 'load_engine', lambda runtime, path: FakeEngine())
+    monkeypatch.setattr(trt_inferencer, 'allocate_buffers', fake_allocate_buffers)
+    monkeypatch.setattr(trt_inferencer, 'do_inference', fake_do_inference)
+
+    def _make(batch_size):
+        fake_allocate_buffers.batch_size = batch_size
+        return trt_inferencer.TRTInferencer(
+            'model.engine', batch_size=batch_size, data_format='channels_first')
+    return _make
+
+
+def test_infer_single(make_inferencer, monkeypatch):
+    inferencer = make_inferencer(1)
+    img = np.random.random(INPUT_SHAPE[2:] + INPUT_SHAPE[1:2]).astype(np.float32)
+    monkeypatch.setattr(inferencer, '_load_img', lambda img_path: (None, 1.0, img))
+    results = inferencer.infer_single('image.png')
+    assert inferencer.numpy_array.shape == (1, np.prod(INPUT_SHAPE[1:]))
+    assert np.allclose(results[0], img.sum() + np.arange(NCLASSES))
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_infer_batch(make_inferencer, batch_size):
+    inferencer = make_inferencer(batch_size)
+    assert inferencer.input_hwc == (8, 8, 3)
+    assert inferencer.output_volume == NCLASSES
+    imgs = np.random.random((batch_size - 1 or 1,) + INPUT_SHAPE[1:]).astype(np.float32)
+    results = inferencer.infer_batch(imgs)
+    expected = imgs.reshape(len(imgs), -1).sum(axis=1)[:, None] + np.arange(NCLASSES)
+    assert np.allclose(results, expected)
+    with pytest.raises(ValueError):
+        inferencer.infer_batch(np.zeros((batch_size + 1,) + INPUT_SHAPE[1:], np.float32))
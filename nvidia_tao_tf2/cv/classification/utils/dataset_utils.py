@@ -0,0 +1,327 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""tf.data input pipeline for classification evaluation."""
+import json
+import logging
+import os
+
+import numpy as np
+import tensorflow as tf
+from tf_keras.src.utils.image_utils import img_to_array
+
+from nvidia_tao_tf2.cv.classification.utils.preprocess_crop import load_and_crop_img
+
+logger = logging.getLogger(__name__)
+
+# Same image formats as keras DirectoryIterator.
+WHITE_LIST_FORMATS = ('png', 'jpg', 'jpeg', 'bmp', 'ppm', 'tif', 'tiff')
+FILE_LIST_CACHE = '.tao_filelist.json'
+EVAL_CACHE_DIR = '.cache'
+EVAL_CACHE_META = 'meta.json'
+EVAL_CACHE_SHARD = 'shard-{:05d}.tfrecord'
+
+
+def _load_file_list_cache(directory, cache_path):
+    """Load a cached image listing if none of the listed directories changed."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if _list_class_names(directory) != list(cache['class_indices']):
+            return None
+        for rel_dir, mtime in cache['dir_mtimes'].items():
+            if os.stat(os.path.join(directory, rel_dir)).st_mtime_ns != mtime:
+                return None
+    except (OSError, ValueError, KeyError):
+        return None
+    filepaths = np.array([os.path.join(directory, f) for f in cache['filenames']])
+    return filepaths, np.array(cache['classes'], dtype=np.int32), cache['class_indices']
+
+
+def _list_class_names(directory):
+    """List class subdirectories in alphanumerical order."""
+    return sorted(e.name for e in os.scandir(directory)
+                  if e.is_dir() and e.name != EVAL_CACHE_DIR)
+
+
+def _save_file_list_cache(cache_path, cache):
+    """Save the image listing next to the dataset, skipping read-only datasets."""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("Failed to write file list cache %s: %s", cache_path, e)
+
+
+def list_image_directory(directory, use_cache=True):
+    """List images in a `flow_from_directory` style dataset.
+
+    Each subdirectory of `directory` is a class and classes are indexed
+    in alphanumerical order, matching keras `DirectoryIterator`.
+    The listing is cached in `directory` and reused as long as the class
+    subdirectories and their modification times are unchanged.
+
+    Args:
+        directory (str): Path to the image directory.
+        use_cache (bool): Whether to read and write the file list cache.
+
+    Returns:
+        filepaths (np.ndarray): Absolute image paths.
+        classes (np.ndarray): Class index of each image.
+        class_indices (dict): Mapping from class name to class index.
+    """
+    cache_path = os.path.join(directory, FILE_LIST_CACHE)
+    if use_cache:
+        cached = _load_file_list_cache(directory, cache_path)
+        if cached is not None:
+            logger.info("Loaded file list from cache: %s", cache_path)
+            return cached
+
+    # The root directory is checked by listing its class subdirectories instead,
+    # since writing the cache file itself changes its modification time.
+    dir_mtimes = {}
+    class_names = _list_class_names(directory)
+    class_indices = dict(zip(class_names, range(len(class_names))))
+    filenames = []
+    classes = []
+    for class_name in class_names:
+        subdir = os.path.join(directory, class_name)
+        for root, _, files in sorted(os.walk(subdir), key=lambda x: x[0]):
+            rel_root = os.path.relpath(root, directory)
+            dir_mtimes[rel_root] = os.stat(root).st_mtime_ns
+            for fname in sorted(files):
+                if fname.lower().endswith(WHITE_LIST_FORMATS):
+                    filenames.append(os.path.join(rel_root, fname))
+                    classes.append(class_indices[class_name])
+
+    if use_cache:
+        _save_file_list_cache(cache_path, {
+            'dir_mtimes': dir_mtimes,
+            'filenames': filenames,
+            'classes': classes,
+            'class_indices': class_indices,
+        })
+    filepaths = np.array([os.path.join(directory, f) for f in filenames])
+    return filepaths, np.array(classes, dtype=np.int32), class_indices
+
+
+def build_eval_dataset(filepaths, image_height, image_width, nchannels,
+                       batch_size, color_mode='rgb', interpolation='nearest',
+                       data_format='channels_first', preprocessing_function=None,
+                       num_parallel_calls=None):
+    """Build a batched and prefetched tf.data pipeline over image files.
+
+    Images are decoded and resized with the same PIL based loader used by
+    keras `ImageDataGenerator`, so the results are identical to
+    `flow_from_directory`, but decoding runs in parallel and overlaps
+    with inference.
+
+    Args:
+        filepaths (np.ndarray): Image paths.
+        image_height (int): Target image height.
+        image_width (int): Target image width.
+        nchannels (int): Number of image channels.
+        batch_size (int): Batch size.
+        color_mode (str): One of "rgb" or "grayscale".
+        interpolation (str): Interpolation and crop method, e.g. "bilinear:center".
+        data_format (str): One of "channels_first" or "channels_last".
+        preprocessing_function (callable): Function applied to each image array.
+        num_parallel_calls (int): Number of images to load in parallel.
+            Defaults to `tf.data.AUTOTUNE`.
+
+    Returns:
+        dataset (tf.data.Dataset): Dataset yielding batches of images.
+    """
+    def _load(path):
+        img = load_and_crop_img(
+            path.decode(),
+            color_mode=color_mode,
+            target_size=(image_height, image_width),
+            interpolation=interpolation)
+        x = img_to_array(img, data_format=data_format, dtype='float32')
+        if hasattr(img, 'close'):
+            img.close()
+        if preprocessing_function is not None:
+            x = preprocessing_function(x)
+        return x.astype(np.float32)
+
+    if data_format == 'channels_first':
+        image_shape = (nchannels, image_height, image_width)
+    else:
+        image_shape = (image_height, image_width, nchannels)
+
+    def _map_fn(path):
+        image = tf.numpy_function(_load, [path], tf.float32)
+        image.set_shape(image_shape)
+        return image
+
+    dataset = tf.data.Dataset.from_tensor_slices(filepaths)
+    dataset = dataset.map(_map_fn, num_parallel_calls=num_parallel_calls or tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.prefetch(tf.data.AUTOTUNE)
+    return dataset
+
+
+def write_eval_cache(directory, image_height, image_width, nchannels,
+                     color_mode='rgb', interpolation='nearest', image_depth=8,
+                     shard_size=1024):
+    """Decode and resize an image directory once into sharded TFRecords.
+
+    Records hold the raw resized pixels in HWC layout, so evaluation can
+    skip JPEG decoding and resizing. The cache is written to
+    `directory/.cache` and its metadata is written last, so an interrupted
+    run leaves no valid cache behind.
+
+    Args:
+        directory (str): Path to the image directory.
+        image_height (int): Target image height.
+        image_width (int): Target image width.
+        nchannels (int): Number of image channels.
+        color_mode (str): One of "rgb" or "grayscale".
+        interpolation (str): Interpolation and crop method, e.g. "bilinear:center".
+        image_depth (int): Bit depth of the images, 8 or 16.
+        shard_size (int): Number of images per TFRecord shard.
+
+    Returns:
+        cache_dir (str): Path to the cache directory.
+    """
+    filepaths, classes, class_indices = list_image_directory(directory)
+    cache_dir = os.path.join(directory, EVAL_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_path = os.path.join(cache_dir, EVAL_CACHE_META)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    dtype = np.uint16 if image_depth == 16 else np.uint8
+
+    num_shards = 0
+    for start in range(0, len(filepaths), shard_size):
+        shard_path = os.path.join(cache_dir, EVAL_CACHE_SHARD.format(num_shards))
+        with tf.io.TFRecordWriter(shard_path) as writer:
+            for path in filepaths[start:start + shard_size]:
+                img = load_and_crop_img(
+                    path,
+                    color_mode=color_mode,
+                    target_size=(image_height, image_width),
+                    interpolation=interpolation)
+                x = img_to_array(img, data_format='channels_last', dtype='float32')
+                if hasattr(img, 'close'):
+                    img.close()
+                example = tf.train.Example(features=tf.train.Features(feature={
+                    'image': tf.train.Feature(
+                        bytes_list=tf.train.BytesList(value=[x.astype(dtype).tobytes()])),
+                }))
+                writer.write(example.SerializeToString())
+        num_shards += 1
+        logger.info("Cached %d/%d images.", min(start + shard_size, len(filepaths)), len(filepaths))
+
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'image_height': image_height,
+            'image_width': image_width,
+            'nchannels': nchannels,
+            'color_mode': color_mode,
+            'interpolation': interpolation,
+            'image_depth': image_depth,
+            'num_shards': num_shards,
+            'classes': classes.tolist(),
+            'class_indices': class_indices,
+        }, f)
+    return cache_dir
+
+
+def load_eval_cache(directory, image_height, image_width, nchannels,
+                    color_mode='rgb', interpolation='nearest', image_depth=8):
+    """Load the metadata of a cache written by `write_eval_cache`.
+
+    Returns:
+        meta (dict): Cache metadata, or None if there is no cache, it was
+            built with different image settings, or the image directory
+            was modified after it was written.
+    """
+    meta_path = os.path.join(directory, EVAL_CACHE_DIR, EVAL_CACHE_META)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        cache_mtime = os.stat(meta_path).st_mtime_ns
+        class_names = _list_class_names(directory)
+        if class_names != list(meta['class_indices']):
+            return None
+        for class_name in class_names:
+            for root, _, _ in os.walk(os.path.join(directory, class_name)):
+                if os.stat(root).st_mtime_ns > cache_mtime:
+                    return None
+    except (OSError, ValueError, KeyError):
+        return None
+    expected = {
+        'image_height': image_height,
+        'image_width': image_width,
+        'nchannels': nchannels,
+        'color_mode': color_mode,
+        'interpolation': interpolation,
+        'image_depth': image_depth,
+    }
+    if any(meta.get(k) != v for k, v in expected.items()):
+        return None
+    return meta
+
+
+def build_cached_eval_dataset(directory, meta, batch_size, data_format='channels_first',
+                              preprocessing_function=None, num_parallel_calls=None):
+    """Build a batched and prefetched tf.data pipeline over a `write_eval_cache` cache.
+
+    Shards are read in order, so batches line up with `meta['classes']`.
+
+    Args:
+        directory (str): Path to the image directory holding the cache.
+        meta (dict): Cache metadata returned by `load_eval_cache`.
+        batch_size (int): Batch size.
+        data_format (str): One of "channels_first" or "channels_last".
+        preprocessing_function (callable): Function applied to each image array.
+        num_parallel_calls (int): Number of images to preprocess in parallel.
+            Defaults to `tf.data.AUTOTUNE`.
+
+    Returns:
+        dataset (tf.data.Dataset): Dataset yielding batches of images.
+    """
+    cache_dir = os.path.join(directory, EVAL_CACHE_DIR)
+    shards = [os.path.join(cache_dir, EVAL_CACHE_SHARD.format(i))
+              for i in range(meta['num_shards'])]
+    hwc = (meta['image_height'], meta['image_width'], meta['nchannels'])
+    dtype = tf.uint16 if meta['image_depth'] == 16 else tf.uint8
+    if data_format == 'channels_first':
+        image_shape = (hwc[2], hwc[0], hwc[1])
+    else:
+        image_shape = hwc
+
+    def _preprocess(x):
+        return preprocessing_function(np.array(x)).astype(np.float32)
+
+    def _map_fn(record):
+        features = tf.io.parse_single_example(
+            record, {'image': tf.io.FixedLenFeature([], tf.string)})
+        image = tf.reshape(tf.io.decode_raw(features['image'], dtype), hwc)
+        image = tf.cast(image, tf.float32)
+        if data_format == 'channels_first':
+            image = tf.transpose(image, [2, 0, 1])
+        if preprocessing_function is not None:
+            image = tf.numpy_function(_preprocess, [image], tf.float32)
+        image.set_shape(image_shape)
+        return image
+
+    dataset = tf.data.TFRecordDataset(shards)
+    dataset = dataset.map(_map_fn, num_parallel_calls=num_parallel_calls or tf.data.AUTOTUNE)
+    dataset = dataset.batch(batch_size)
+    dataset = dataset.prefetch(tf.data.AUTOTUNE)
+    return dataset
@@ -18,15 +18,15 @@ import os
 import cv2
 import importlib
 import json
+import threading
 import warnings
 
 from tensorflow import keras
 import tensorflow as tf
 from numba import errors
-from numba import jit, njit
+from numba import njit
 import numpy as np
 
-from PIL import Image
 import tempfile
 import zipfile
 
@@ -45,12 +45,32 @@ warnings.simplefilter('ignore', category=errors.NumbaWarning)
 warnings.simplefilter('ignore', category=errors.NumbaDeprecationWarning)
 warnings.simplefilter('ignore', category=errors.NumbaPendingDeprecationWarning)
 
+# uint8 pixel values, used to build the color augmentation lookup tables
+_UINT8_VALUES = np.arange(256, dtype=np.int32)
+# per process and thread random generator for data augmentation, see `_get_rng`
+_RNG_LOCAL = threading.local()
+
 opt_dict = {
     'sgd': keras.optimizers.legacy.SGD,
     'adam': keras.optimizers.legacy.Adam,
     'rmsprop': keras.optimizers.legacy.RMSprop
 }
 
+# optimizer specific config fields, passed as keyword arguments of the same name
+optim_args_dict = {
+    'sgd': ('momentum', 'decay', 'nesterov'),
+    'adam': ('beta_1', 'beta_2', 'epsilon', 'decay'),
+    'rmsprop': ('rho', 'epsilon', 'decay')
+}
+
+# scheduler class and its specific config fields
+lr_scheduler_dict = {
+    'step': (StepLRScheduler, ('gamma', 'step_size')),
+    'soft_anneal': (MultiGPULearningRateScheduler,
+                    ('soft_start', 'annealing_points', 'annealing_divider')),
+    'cosine': (SoftStartCosineAnnealingScheduler, ('min_lr_ratio', 'soft_start'))
+}
+
 scope_dict = {'dense': keras.layers.Dense,
               'conv2d': keras.layers.Conv2D}
 
@@ -69,62 +89,30 @@ def initialize():
 
 def build_optimizer(optimizer_config):
     """build optimizer with the optimizer config."""
-    if optimizer_config.optimizer == "sgd":
-        return opt_dict["sgd"](
-            learning_rate=optimizer_config.lr,
-            momentum=optimizer_config.momentum,
-            decay=optimizer_config.decay,
-            nesterov=optimizer_config.nesterov
-        )
-    if optimizer_config.optimizer == "adam":
-        return opt_dict["adam"](
-            learning_rate=optimizer_config.lr,
-            beta_1=optimizer_config.beta_1,
-            beta_2=optimizer_config.beta_2,
-            epsilon=optimizer_config.epsilon,
-            decay=optimizer_config.decay
-        )
-    if optimizer_config.optimizer == "rmsprop":
-        return opt_dict["rmsprop"](
-            learning_rate=optimizer_config.lr,
-            rho=optimizer_config.rho,
-            epsilon=optimizer_config.epsilon,
-            decay=optimizer_config.decay
-        )
-    raise ValueError(f"Unsupported Optimizer: {optimizer_config.optimizer}")
+    name = optimizer_config.optimizer
+    if name not in opt_dict:
+        raise ValueError(f"Unsupported Optimizer: {name}")
+    return opt_dict[name](
+        learning_rate=optimizer_config.lr,
+        **{k: getattr(optimizer_config, k) for k in optim_args_dict[name]}
+    )
 
 
 def build_lr_scheduler(lr_config, hvd_size, max_iterations):
     """Build a learning rate scheduler from config."""
     # Set up the learning rate callback. It will modulate learning rate
     # based on iteration progress to reach max_iterations.
-    if lr_config.scheduler == 'step':
-        lrscheduler = StepLRScheduler(
-            base_lr=lr_config.learning_rate * hvd_size,
-            gamma=lr_config.gamma,
-            step_size=lr_config.step_size,
-            max_iterations=max_iterations
-        )
-    elif lr_config.scheduler == 'soft_anneal':
-        lrscheduler = MultiGPULearningRateScheduler(
-            base_lr=lr_config.learning_rate * hvd_size,
-            soft_start=lr_config.soft_start,
-            annealing_points=lr_config.annealing_points,
-            annealing_divider=lr_config.annealing_divider,
-            max_iterations=max_iterations
-        )
-    elif lr_config.scheduler == 'cosine':
-        lrscheduler = SoftStartCosineAnnealingScheduler(
-            base_lr=lr_config.learning_rate * hvd_size,
-            min_lr_ratio=lr_config.min_lr_ratio,
-            soft_start=lr_config.soft_start,
-            max_iterations=max_iterations
-        )
-    else:
+    name = lr_config.scheduler
+    if name not in lr_scheduler_dict:
         raise ValueError(
-            f"Only `step`, `cosine` and `soft_anneal`. LR scheduler are supported, but {lr_config.scheduler} is specified."
+            f"Only `step`, `cosine` and `soft_anneal`. LR scheduler are supported, but {name} is specified."
         )
-    return lrscheduler
+    scheduler_cls, args = lr_scheduler_dict[name]
+    return scheduler_cls(
+        base_lr=lr_config.learning_rate * hvd_size,
+        max_iterations=max_iterations,
+        **{k: getattr(lr_config, k) for k in args}
+    )
 
 
 def get_input_shape(model, data_format):
@@ -139,57 +127,97 @@ def get_input_shape(model, data_format):
     return image_height, image_width, nchannels
 
 
+def _hsv_lut_shift(img, hue_delta=0.0, saturation_shift=0.0):
+    """Rotate the hue and shift the saturation of a uint8 image in one HSV round trip.
+
+    Uses the 8-bit HSV representation of OpenCV, where H is in [0, 180)
+    and S is in [0, 255], and applies both shifts with one 3-channel
+    lookup table, so the HSV image is only read and written once.
+
+    Args:
+        img: input image in uint8
+        hue_delta: hue rotation in degrees
+        saturation_shift: saturation shift in [-1.0, 1.0]
+    """
+    hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+    # hue should always be within [0, 180) and saturation within [0, 255]
+    lut = np.stack([
+        np.mod(_UINT8_VALUES + int(round(hue_delta / 2.0)), 180),
+        np.clip(_UINT8_VALUES + int(round(saturation_shift * 255.0)), 0, 255),
+        _UINT8_VALUES,
+    ], axis=-1).astype(np.uint8).reshape(256, 1, 3)
+    return cv2.cvtColor(cv2.LUT(hsv, lut), cv2.COLOR_HSV2BGR)
+
+
 def random_hue(img, max_delta=10.0):
     """Rotates the hue channel.
 
     Args:
-        img: input image in float32
+        img: input image in uint8
         max_delta: Max number of degrees to rotate the hue channel
     """
     # Rotates the hue channel by delta degrees
-    delta = np.random.random() * (2 * max_delta) - max_delta
-    hsv = cv2.cvtColor(img.astype(np.float32), cv2.COLOR_BGR2HSV)
-    hchannel = hsv[:, :, 0]
-    hchannel = delta + hchannel
-    # hue should always be within [0,360]
-    idx = np.where(hchannel > 360)
-    hchannel[idx] = hchannel[idx] - 360
-    idx = np.where(hchannel < 0)
-    hchannel[idx] = hchannel[idx] + 360
-    hsv[:, :, 0] = hchannel
-    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    delta = randu(-max_delta, max_delta)
+    return _hsv_lut_shift(img, hue_delta=delta)
 
 
 def random_saturation(img, max_shift):
     """random saturation data augmentation."""
-    hsv = cv2.cvtColor(img.astype(np.float32), cv2.COLOR_BGR2HSV)
-    shift = np.random.random() * (2 * max_shift) - max_shift
-    # saturation should always be within [0,1.0]
-    hsv[:, :, 1] = np.clip(hsv[:, :, 1] + shift, 0.0, 1.0)
-    return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+    shift = randu(-max_shift, max_shift)
+    return _hsv_lut_shift(img, saturation_shift=shift)
+
+
+def _get_rng():
+    """Get the random generator of the current process and thread.
+
+    Data loader workers are threads, or forked processes that inherit the
+    global NumPy state. Each (process, thread) pair gets its own generator,
+    seeded with a `SeedSequence` that mixes the global NumPy state with the
+    pid and thread id. Workers thus neither contend on one generator's lock
+    nor repeat each other's augmentations, and `set_random_seed` still
+    sets the base entropy.
+    """
+    pid = os.getpid()
+    if getattr(_RNG_LOCAL, 'pid', None) != pid:
+        seed = np.random.SeedSequence(
+            int(np.random.randint(2 ** 32, dtype=np.uint64)),
+            spawn_key=(pid, threading.get_ident()))
+        _RNG_LOCAL.rng = np.random.default_rng(seed)
+        _RNG_LOCAL.pid = pid
+    return _RNG_LOCAL.rng
 
 
-@njit
 def randu(low, high):
     """standard uniform distribution."""
-    return np.random.random() * (high - low) + low
+    return _get_rng().uniform(low, high)
+
+
+def _contrast(img, center, scale):
+    """Scale the contrast of a uint8 image around `center`."""
+    lut = (_UINT8_VALUES / 255.0 - center) * scale + center
+    lut = np.clip(np.round(lut * 255.0), 0, 255).astype(np.uint8)
+    return cv2.LUT(img, lut)
+
+
+def _shift(img, shift):
+    """Shift the intensity of a uint8 image by `shift` in [-1.0, 1.0]."""
+    offset = int(round(shift * 255.0))
+    if offset == 0:
+        # e.g. the default color_shift_stddev of 0
+        return img
+    # saturating add, like cv2.add on uint8
+    lut = np.clip(_UINT8_VALUES + offset, 0, 255).astype(np.uint8)
+    return cv2.LUT(img, lut)
 
 
-@jit
 def random_contrast(img, center, max_contrast_scale):
-    """random contrast data augmentation."""
-    new_img = (img - center) * (1.0 + randu(-max_contrast_scale, max_contrast_scale)) + center
-    new_img = np.clip(new_img, 0., 1.)
-    return new_img
+    """random contrast data augmentation on a uint8 image."""
+    return _contrast(img, center, 1.0 + randu(-max_contrast_scale, max_contrast_scale))
 
 
-@jit
 def random_shift(x_img, shift_stddev):
-    """random shift data augmentation."""
-    shift = np.random.randn() * shift_stddev
-    new_img = np.clip(x_img + shift, 0.0, 1.0)
-
-    return new_img
+    """random shift data augmentation on a uint8 image."""
+    return _shift(x_img, _get_rng().standard_normal() * shift_stddev)
 
 
 def color_augmentation(
@@ -200,34 +228,104 @@ def color_augmentation(
     contrast_center=0.5,
     contrast_scale_max=0.1
 ):
-    """color augmentation for images."""
-    # convert PIL Image to numpy array
-    x_img = np.array(x_img, dtype=np.float32)
-    # normalize the image to (0, 1)
-    x_img /= 255.0
-    x_img = random_shift(x_img, color_shift_stddev)
-    x_img = random_hue(x_img, max_delta=hue_rotation_max)
-    x_img = random_saturation(x_img, saturation_shift_max)
-    x_img = random_contrast(
-        x_img,
-        contrast_center,
-        contrast_scale_max
-    )
-    # convert back to PIL Image
-    x_img *= 255.0
-    return Image.fromarray(x_img.astype(np.uint8), "RGB")
+    """color augmentation for images.
 
+    All steps run on uint8 arrays with OpenCV lookup tables, and hue and
+    saturation share a single HSV conversion.
 
-def setup_config(model, reg_config, bn_config=None, custom_objs=None):
+    Args:
+        x_img: RGB image, as a PIL Image or a uint8 HWC array.
+    Return:
+        The augmented image as a uint8 HWC array.
+    """
+    rng = _get_rng()
+    shift = rng.standard_normal() * color_shift_stddev
+    hue_delta, saturation_shift, contrast_scale = rng.uniform(-1.0, 1.0, size=3) * (
+        hue_rotation_max, saturation_shift_max, contrast_scale_max)
+    # no copy if x_img is already a uint8 array
+    x_img = np.asarray(x_img, dtype=np.uint8)
+    x_img = _shift(x_img, shift)
+    x_img = _hsv_lut_shift(x_img, hue_delta, saturation_shift)
+    x_img = _contrast(x_img, contrast_center, 1.0 + contrast_scale)
+    return x_img
+
+
+@njit(cache=True)
+def confusion_matrix_and_scores(y_true, y_pred, nclasses):
+    """Compute the confusion matrix and per-class scores in a single pass.
+
+    Args:
+        y_true (np.ndarray): ground truth class indices.
+        y_pred (np.ndarray): predicted class indices.
+        nclasses (int): number of classes.
+
+    Returns:
+        cm (np.ndarray): confusion matrix of shape (nclasses, nclasses).
+        precision, recall, f1, support (np.ndarray): per-class scores.
+    """
+    cm = np.zeros((nclasses, nclasses), dtype=np.int64)
+    for i in range(y_true.shape[0]):
+        cm[y_true[i], y_pred[i]] += 1
+    precision = np.zeros(nclasses, dtype=np.float64)
+    recall = np.zeros(nclasses, dtype=np.float64)
+    f1 = np.zeros(nclasses, dtype=np.float64)
+    support = np.zeros(nclasses, dtype=np.int64)
+    for c in range(nclasses):
+        tp = cm[c, c]
+        predicted = 0
+        for r in range(nclasses):
+            predicted += cm[r, c]
+            support[c] += cm[c, r]
+        # zero division is reported as 0, same as sklearn
+        if predicted > 0:
+            precision[c] = tp / predicted
+        if support[c] > 0:
+            recall[c] = tp / support[c]
+        if precision[c] + recall[c] > 0:
+            f1[c] = 2 * precision[c] * recall[c] / (precision[c] + recall[c])
+    return cm, precision, recall, f1, support
+
+
+def format_classification_report(target_names, precision, recall, f1, support, digits=2):
+    """Format per-class scores in the same layout as sklearn classification_report."""
+    headers = ["precision", "recall", "f1-score", "support"]
+    total = support.sum()
+    width = max(max(len(cn) for cn in target_names), len("weighted avg"), digits)
+    head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+    report = head_fmt.format("", *headers, width=width) + "\n\n"
+    for row in zip(target_names, precision, recall, f1, support):
+        report += row_fmt.format(*row, width=width, digits=digits)
+    report += "\n"
+    accuracy = recall.dot(support) / total if total > 0 else 0.
+    report += ("{:>{width}s} " + " {:>9}" * 2 + " {:>9.{digits}f}" + " {:>9}\n").format(
+        "accuracy", "", "", accuracy, total, width=width, digits=digits)
+    report += row_fmt.format(
+        "macro avg", precision.mean(), recall.mean(), f1.mean(), total,
+        width=width, digits=digits)
+    weights = support / total if total > 0 else np.zeros_like(precision)
+    report += row_fmt.format(
+        "weighted avg", precision.dot(weights), recall.dot(weights), f1.dot(weights), total,
+        width=width, digits=digits)
+    return report
+
+
+def setup_config(model, reg_config, bn_config=None, custom_objs=None, copy=False):
     """Wrapper for setting up BN and regularizer.
 
+    The layers are updated in place when possible. The model is rebuilt from
+    its config instead when `copy` is set, or when a layer in scope already
+    has a kernel regularizer, since that regularization loss was registered
+    at construction time and cannot be replaced in place.
+
     Args:
         model (keras Model): a Keras model
         reg_config (dict): reg_config dict
         bn_config (dict): config to override BatchNormalization parameters
         custom_objs (dict): Custom objects for serialization and deserialization.
+        copy (bool): Whether to always return a new model.
     Return:
-        A new model with overridden config.
+        A model with overridden config.
     """
     if bn_config is not None:
         bn_momentum = bn_config['momentum']
@@ -235,42 +333,70 @@ def setup_config(model, reg_config, bn_config=None, custom_objs=None):
     else:
         bn_momentum = 0.9
         bn_epsilon = 1e-5
-    # Obtain the current configuration from model
-    mconfig = model.get_config()
     # Obtain type and scope of the regularizer
     reg_type = reg_config['type'].lower()
     scope_list = reg_config['scope']
-    layer_list = [scope_dict[i.lower()] for i in scope_list if i.lower()
-                  in scope_dict]
+    # Exact type match, so subclasses such as Conv2DTranspose are left untouched.
+    layer_types = frozenset(scope_dict[i.lower()] for i in scope_list if i.lower()
+                            in scope_dict)
+    reg_layers = []
+    if reg_type:
+        reg_layers = [layer for layer in model.layers
+                      if type(layer) in layer_types and hasattr(layer, 'kernel_regularizer')]
+
+    regularizer = None
+    if reg_layers:
+        assert reg_type in ['l1', 'l2', 'none'], \
+            "Regularizer can only be either L1, L2 or None."
+
+        if reg_type in ['l1', 'l2']:
+            assert 0 < reg_config['weight_decay'] < 1, \
+                "Weight decay should be no less than 0 and less than 1"
+            regularizer = regularizer_dict[reg_type](
+                reg_config['weight_decay'])
 
-    for layer, layer_config in zip(model.layers, mconfig['layers']):
+    if custom_objs:
+        CUSTOM_OBJS.update(custom_objs)
+
+    if copy or any(layer.kernel_regularizer is not None for layer in reg_layers):
+        return _setup_config_from_config(
+            model, bn_momentum, bn_epsilon, reg_layers, regularizer)
+
+    for layer in model.layers:
         # BN settings
         if isinstance(layer, keras.layers.BatchNormalization):
-            layer_config['config']['momentum'] = bn_momentum
-            layer_config['config']['epsilon'] = bn_epsilon
+            layer.momentum = bn_momentum
+            layer.epsilon = bn_epsilon
 
-        # Regularizer settings
-        if reg_type:
-            if type(layer) in layer_list and \
-               hasattr(layer, 'kernel_regularizer'):
+    # Regularizer settings
+    if regularizer is not None:
+        for layer in reg_layers:
+            layer.kernel_regularizer = regularizer
+            layer.add_loss(lambda layer=layer: layer.kernel_regularizer(layer.kernel))
 
-                assert reg_type in ['l1', 'l2', 'none'], \
-                    "Regularizer can only be either L1, L2 or None."
+    return model
 
-                if reg_type in ['l1', 'l2']:
-                    assert 0 < reg_config['weight_decay'] < 1, \
-                        "Weight decay should be no less than 0 and less than 1"
-                    regularizer = regularizer_dict[reg_type](
-                        reg_config['weight_decay'])
-                    layer_config['config']['kernel_regularizer'] = \
-                        {'class_name': regularizer.__class__.__name__,
-                         'config': regularizer.get_config()}
 
-                if reg_type == 'none':
-                    layer_config['config']['kernel_regularizer'] = None
+def _setup_config_from_config(model, bn_momentum, bn_epsilon, reg_layers, regularizer):
+    """Rebuild a model from its config with overridden BN and regularizer settings."""
+    # Obtain the current configuration from model
+    mconfig = model.get_config()
+    reg_layers = set(id(layer) for layer in reg_layers)
+    # Serialize the regularizer once; each layer gets its own shallow copy.
+    reg_layer_config = None
+    if regularizer is not None:
+        reg_layer_config = {'class_name': regularizer.__class__.__name__,
+                            'config': regularizer.get_config()}
+    for layer, layer_config in zip(model.layers, mconfig['layers']):
+        # BN settings
+        if isinstance(layer, keras.layers.BatchNormalization):
+            layer_config['config']['momentum'] = bn_momentum
+            layer_config['config']['epsilon'] = bn_epsilon
 
-    if custom_objs:
-        CUSTOM_OBJS.update(custom_objs)
+        # Regularizer settings
+        if id(layer) in reg_layers:
+            layer_config['config']['kernel_regularizer'] = \
+                dict(reg_layer_config) if reg_layer_config is not None else None
 
     with keras.utils.CustomObjectScope(CUSTOM_OBJS):
         updated_model = keras.models.Model.from_config(mconfig)
@@ -77,7 +77,8 @@ def load_and_crop_img(path, grayscale=False, color_mode='rgb', target_size=None,
             "box", "hamming" By default, "nearest" is used.
             Supported crop methods are "none", "center", "random".
     # Returns
-        A PIL Image instance.
+        A PIL Image instance, or a uint8 HWC array if color augmentation
+        is applied. Both are accepted by `img_to_array`.
     # Raises
         ImportError: if PIL is not available.
         ValueError: if interpolation method is not supported.
@@ -172,7 +173,7 @@ def load_and_crop_img(path, grayscale=False, color_mode='rgb', target_size=None,
                      down_shift,
                      target_width + left_shift,
                      target_height + down_shift))
-                # color augmentation
+                # color augmentation, returned as an array to skip the PIL round trip
                 if COLOR_AUGMENTATION and img.mode == "RGB":
                     return color_augmentation(img)
                 return img
@@ -14,6 +14,7 @@
 
 """EFF Checkpoint Callback."""
 
+import atexit
 import os
 import shutil
 import tempfile
@@ -55,21 +56,25 @@ class EffCheckpoint(tf.keras.callbacks.ModelCheckpoint):
         self.encryption_key = encryption_key
         self.graph_only = graph_only
         self.is_qat = is_qat
+        # Staging root for the per-save checkpoint directories, removed at exit.
+        self.checkpoint_dir = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, self.checkpoint_dir, ignore_errors=True)
 
-    def _remove_tmp_files(self):
-        """Remove temporary zip file and directory."""
-        shutil.rmtree(os.path.dirname(self.filepath))
+    def _remove_tmp_files(self, checkpoint_dir):
+        """Remove temporary zip file and saved checkpoint."""
+        shutil.rmtree(checkpoint_dir)
         os.remove(self.temp_zip_file)
 
     def on_epoch_end(self, epoch, logs=None):
         """Override on_epoch_end."""
         self.epochs_since_last_save += 1
         eff_epoch = epoch + 1  # eff name started with 001
-        checkpoint_dir = tempfile.mkdtemp()
-        self.filepath = os.path.join(checkpoint_dir, f'ckpt-{epoch:03d}')  # override filepath
 
         # pylint: disable=protected-access
         if self.save_freq == 'epoch' and self.epochs_since_last_save >= self.period:
+            # Fresh directory per save, so each .tlt only packs this epoch's checkpoint.
+            checkpoint_dir = tempfile.mkdtemp(dir=self.checkpoint_dir)
+            self.filepath = os.path.join(checkpoint_dir, f'ckpt-{epoch:03d}')  # override filepath
             self._save_model(epoch=epoch, batch=None, logs=logs)  # To self.filepath
             if self.graph_only:
                 eff_filename = f"{self.model.name}.resume"
@@ -86,6 +91,6 @@ class EffCheckpoint(tf.keras.callbacks.ModelCheckpoint):
             eff_model_path = os.path.join(self.eff_dir, eff_filename)
             # convert content in self.filepath to EFF
             self.temp_zip_file = encode_eff(
-                os.path.dirname(self.filepath),
+                checkpoint_dir,
                 eff_model_path, self.encryption_key)
-            self._remove_tmp_files()
+            self._remove_tmp_files(checkpoint_dir)
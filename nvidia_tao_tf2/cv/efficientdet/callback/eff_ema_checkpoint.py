@@ -14,6 +14,7 @@
 
 """EFF EMA Checkpoint Callback."""
 
+import atexit
 import os
 import shutil
 import tempfile
@@ -67,6 +68,9 @@ class EffEmaCheckpoint(tf.keras.callbacks.ModelCheckpoint):
         self.eff_dir = eff_dir
         self.encryption_key = encryption_key
         self.is_qat = is_qat
+        # Staging root for the per-save checkpoint directories, removed at exit.
+        self.checkpoint_dir = tempfile.mkdtemp()
+        atexit.register(shutil.rmtree, self.checkpoint_dir, ignore_errors=True)
 
     def set_model(self, model):
         """Set model."""
@@ -90,21 +94,22 @@ class EffEmaCheckpoint(tf.keras.callbacks.ModelCheckpoint):
             super()._save_model(epoch, batch, logs)
             self.model.set_weights(non_avg_weights)
 
-    def _remove_tmp_files(self):
-        """Remove temporary zip file and directory."""
+    def _remove_tmp_files(self, checkpoint_dir):
+        """Remove temporary zip file and saved checkpoint."""
         # TODO(@yuw): try catch?
         os.remove(self.temp_zip_file)
-        shutil.rmtree(os.path.dirname(self.filepath))
+        shutil.rmtree(checkpoint_dir)
 
     def on_epoch_end(self, epoch, logs=None):
         """Override on_epoch_end."""
         self.epochs_since_last_save += 1
         eff_epoch = epoch + 1  # eff name started with 001
-        checkpoint_dir = tempfile.mkdtemp()
-        self.filepath = os.path.join(checkpoint_dir, f'emackpt-{epoch:03d}')  # override filepath
 
         # pylint: disable=protected-access
         if self.save_freq == 'epoch' and self.epochs_since_last_save >= self.period:
+            # Fresh directory per save, so each .tlt only packs this epoch's checkpoint.
+            checkpoint_dir = tempfile.mkdtemp(dir=self.checkpoint_dir)
+            self.filepath = os.path.join(checkpoint_dir, f'emackpt-{epoch:03d}')  # override filepath
             self._save_model(epoch=epoch, batch=None, logs=logs)  # To self.filepath
             # WORKAROUND to save QAT graph
             if self.is_qat:
@@ -120,4 +125,4 @@ class EffEmaCheckpoint(tf.keras.callbacks.ModelCheckpoint):
             self.temp_zip_file = encode_eff(
                 checkpoint_dir,
                 eff_model_path, self.encryption_key)
-            self._remove_tmp_files()
+            self._remove_tmp_files(checkpoint_dir)
@@ -14,6 +14,7 @@
 
 """Callback related utils."""
 
+from concurrent import futures
 import os
 from mpi4py import MPI
 import numpy as np
@@ -22,7 +23,7 @@ from tensorflow_addons.optimizers import MovingAverage
 
 import nvidia_tao_tf2.common.logging.logging as status_logging
 
-from nvidia_tao_tf2.cv.efficientdet.processor.postprocessor import EfficientDetPostprocessor
+from nvidia_tao_tf2.cv.efficientdet.processor.postprocessor import EfficientDetPostprocessor, transform_detections
 from nvidia_tao_tf2.cv.efficientdet.utils import coco_metric
 from nvidia_tao_tf2.cv.efficientdet.utils import label_utils
 from nvidia_tao_tf2.cv.efficientdet.utils.helper import fetch_optimizer
@@ -66,23 +67,31 @@ class COCOEvalCallback(tf.keras.callbacks.Callback):
             labels['image_scales'],
             labels['source_ids'])
 
-        def transform_detections(detections):
-            # A transforms detections in [id, x1, y1, x2, y2, score, class]
-            # form to [id, x, y, w, h, score, class]."""
-            return tf.stack([
-                detections[:, :, 0],
-                detections[:, :, 1],
-                detections[:, :, 2],
-                detections[:, :, 3] - detections[:, :, 1],
-                detections[:, :, 4] - detections[:, :, 2],
-                detections[:, :, 5],
-                detections[:, :, 6],
-            ], axis=-1)
-
-        tf.numpy_function(
-            self.evaluator.update_state,
-            [labels['groundtruth_data'], transform_detections(detections)], [])
-        return detections, labels['image_scales']
+        return detections, transform_detections(detections), labels['image_scales']
+
+    def write_image_preview(self, image, detections, scale, epoch):
+        """Draw detections on an image and write it to tensorboard."""
+        if self.hparams['data_format'] == 'channels_first':
+            image = tf.transpose(image, (1, 2, 0))
+        # decode image
+        image = vis_utils.denormalize_image(image.numpy())
+        predictions = detections.numpy()
+        boxes = (predictions[:, 1:5] / float(scale)).astype(np.int32)
+        boxes = boxes[:, [1, 0, 3, 2]]
+        classes = predictions[:, -1].astype(np.int32)
+        scores = predictions[:, -2]
+
+        image = vis_utils.visualize_boxes_and_labels_on_image_array(
+            image,
+            boxes,
+            classes,
+            scores,
+            {},
+            min_score_thresh=0.3,
+            max_boxes_to_draw=100,
+            line_thickness=2)
+        with self.file_writer.as_default():
+            tf.summary.image('Image Preview', tf.expand_dims(image, axis=0), step=epoch)
 
     def evaluate(self, epoch):
         """Run evalution at Nth epoch."""
@@ -91,37 +100,28 @@ class COCOEvalCallback(tf.keras.callbacks.Callback):
         self.eval_model.set_weights(self.model.get_weights())
         self.evaluator.reset_states()
         # evaluate all images.
-        for i, (images, labels) in enumerate(self.dataset):
-            detections, scales = self.eval_model_fn(images, labels)
-            # [id, x1, y1, x2, y2, score, class]
-            if self.hparams['image_preview'] and i == 0:
-                bs_index = 0
-                image = np.copy(images[bs_index])
-                if self.hparams['data_format'] == 'channels_first':
-                    image = np.transpose(image, (1, 2, 0))
-                # decode image
-                image = vis_utils.denormalize_image(image)
-                predictions = np.array(detections[bs_index])
-                predictions[:, 1:5] /= scales[bs_index]
-                boxes = predictions[:, 1:5].astype(np.int32)
-                boxes = boxes[:, [1, 0, 3, 2]]
-                classes = predictions[:, -1].astype(np.int32)
-                scores = predictions[:, -2]
-
-                image = vis_utils.visualize_boxes_and_labels_on_image_array(
-                    image,
-                    boxes,
-                    classes,
-                    scores,
-                    {},
-                    min_score_thresh=0.3,
-                    max_boxes_to_draw=100,
-                    line_thickness=2)
-                with self.file_writer.as_default():
-                    tf.summary.image('Image Preview', tf.expand_dims(image, axis=0), step=epoch)
-            # draw detections
-            if is_main_process():
-                self.pbar.update(i)
+        # The evaluator update and the image preview run on a host thread so that
+        # they overlap with inference on the next batch. A single worker keeps the
+        # evaluator updates ordered.
+        with futures.ThreadPoolExecutor(max_workers=1) as pool:
+            pending = []
+            for i, (images, labels) in enumerate(self.dataset):
+                # [id, x1, y1, x2, y2, score, class]
+                detections, coco_detections, scales = self.eval_model_fn(images, labels)
+                pending.append(pool.submit(
+                    self.evaluator.update_state,
+                    labels['groundtruth_data'].numpy(),
+                    coco_detections.numpy()))
+                # draw detections
+                if self.hparams['image_preview'] and i == 0:
+                    bs_index = 0
+                    pending.append(pool.submit(
+                        self.write_image_preview,
+                        images[bs_index], detections[bs_index], scales[bs_index], epoch))
+                if is_main_process():
+                    self.pbar.update(i)
+            for future in pending:
+                future.result()
 
         # gather detections from all ranks
         self.evaluator.gather()
@@ -19,6 +19,7 @@ import multiprocessing
 import tensorflow as tf
 
 from nvidia_tao_tf2.blocks.dataloader.dataset import Dataset
+from nvidia_tao_tf2.cv.efficientdet.dataloader.datasource import match_files
 from nvidia_tao_tf2.cv.efficientdet.utils import model_utils
 from nvidia_tao_tf2.cv.efficientdet.model import anchors
 from nvidia_tao_tf2.cv.efficientdet.utils.horovod_utils import get_rank, get_world_size, is_main_process
@@ -251,7 +252,9 @@ class CocoDataset(Dataset):
                  is_training,
                  use_fake_data=False,
                  max_instances_per_image=None,
-                 sampling='uniform'):
+                 sampling='uniform',
+                 num_shards=1,
+                 shard_index=0):
         """Dataloader for COCO format dataset.
 
         Args:
@@ -260,6 +263,8 @@ class CocoDataset(Dataset):
             use_fake_data (bool, optional): Whether to use fake data. Defaults to False.
             max_instances_per_image (int, optional): Max number of instances to detect per image.
             sampling (str, optional): sampling method. Defaults to 'uniform'.
+            num_shards (int, optional): Number of eval shards. Defaults to 1.
+            shard_index (int, optional): Eval shard kept by this loader. Defaults to 0.
         """
         self._data_sources = data_sources
         self._is_training = is_training
@@ -269,6 +274,8 @@ class CocoDataset(Dataset):
         assert sampling in ['uniform', 'proportional'], \
             f"Sampling method {sampling} is not supported."
         self._sampling = sampling
+        self._num_shards = num_shards
+        self._shard_index = shard_index
 
     @tf.autograph.experimental.do_not_convert
     def dataset_parser(self, value, example_decoder, anchor_labeler, params):
@@ -437,12 +444,13 @@ class CocoDataset(Dataset):
         datasets = []
         weights = []
         for file_pattern, image_dir in self._data_sources:
-            dataset = tf.data.Dataset.list_files(
-                file_pattern,
-                shuffle=params['shuffle_file'] and self._is_training)
+            # List files in a fixed order so that every rank shards the same list
+            # and reads a disjoint set of files; shuffle only the local shard.
+            dataset = tf.data.Dataset.from_tensor_slices(list(match_files(file_pattern)))
             if self._is_training:
                 dataset = dataset.shard(get_world_size(), get_rank())
-                dataset.shuffle(buffer_size=64)
+                if params['shuffle_file']:
+                    dataset = dataset.shuffle(buffer_size=64, reshuffle_each_iteration=True)
 
             # Prefetch data from files.
             def _prefetch_dataset(filename):
@@ -459,6 +467,9 @@ class CocoDataset(Dataset):
                 num_parallel_calls=tf.data.experimental.AUTOTUNE)  # TODO(@yuw): whether to fix the number
 
             dataset = dataset.with_options(self.dataset_options)
+            if not self._is_training and self._num_shards > 1:
+                # Shard records before parsing so each rank only decodes its own images.
+                dataset = dataset.shard(self._num_shards, self._shard_index)
             if self._is_training:
                 dataset = dataset.shuffle(
                     buffer_size=params['shuffle_buffer'],
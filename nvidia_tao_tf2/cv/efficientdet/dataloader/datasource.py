@@ -14,6 +14,49 @@
 """Data Source Class."""
 import os
 
+import tensorflow as tf
+
+# Last listing of each TFRecord pattern, with the mtime of its directory.
+_MATCH_CACHE = {}
+
+
+def _dir_mtime(pattern):
+    """Return the mtime in ns of a local, wildcard-free pattern directory, else None."""
+    dirname = os.path.dirname(pattern)
+    if '://' in pattern or any(c in dirname for c in '*?['):
+        return None
+    try:
+        return os.stat(dirname or '.').st_mtime_ns
+    except OSError:
+        return None
+
+
+def match_files(pattern):
+    """Glob a TFRecord pattern, reusing the listing while its directory is unchanged.
+
+    Train and val often point at the same shards, so both loaders share
+    one listing instead of each expanding the pattern on the filesystem.
+    Adding, removing or renaming files changes the directory mtime and
+    forces a new glob. Remote patterns and patterns with wildcards in
+    the directory part are globbed on every call.
+
+    Args:
+        pattern (str): TFRecord file pattern.
+
+    Returns:
+        Sorted tuple of matching file paths.
+    """
+    mtime = _dir_mtime(pattern)
+    cached = _MATCH_CACHE.get(pattern)
+    if mtime is not None and cached is not None and cached[0] == mtime:
+        return cached[1]
+    files = tuple(sorted(tf.io.gfile.glob(pattern)))
+    if not files:
+        raise ValueError(f"No TFRecord files match {pattern}.")
+    if mtime is not None:
+        _MATCH_CACHE[pattern] = (mtime, files)
+    return files
+
 
 class DataSource:
     """Datasource class."""
@@ -200,23 +200,26 @@ class EngineBuilder:
         elif precision == "int8":
             if not self.builder.platform_has_fast_int8:
                 logger.warning("INT8 is not supported natively on this platform/device")
-            elif self.is_qat:
-                print("Exporting a QAT model...")
-                self.config.set_flag(trt.BuilderFlag.INT8)
             else:
-                assert calib_cache, "cal_cache_file must be specified when exporting a model in PTQ INT8 mode."
                 if self.builder.platform_has_fast_fp16:
                     # Also enable fp16, as some layers may be even more efficient in fp16 than int8
                     self.config.set_flag(trt.BuilderFlag.FP16)
                 self.config.set_flag(trt.BuilderFlag.INT8)
-                self.config.int8_calibrator = EngineCalibrator(calib_cache)
-                if not os.path.exists(calib_cache):
-                    calib_shape = [calib_batch_size] + list(inputs[0].shape[1:])
-                    calib_dtype = trt.nptype(inputs[0].dtype)
-                    self.config.int8_calibrator.set_image_batcher(
-                        ImageBatcher(calib_input, calib_shape, calib_dtype,
-                                     max_num_images=calib_num_images,
-                                     exact_batches=True))
+                if self.is_qat:
+                    print("Exporting a QAT model...")
+                else:
+                    assert calib_cache, "cal_cache_file must be specified when exporting a model in PTQ INT8 mode."
+                    self.config.int8_calibrator = EngineCalibrator(calib_cache)
+                    if os.path.exists(calib_cache):
+                        # TensorRT reads the scales from the cache, no calibration images are needed.
+                        logger.info("Reusing calibration cache: {}".format(calib_cache))  # noqa pylint: disable=C0209
+                    else:
+                        calib_shape = [calib_batch_size] + list(inputs[0].shape[1:])
+                        calib_dtype = trt.nptype(inputs[0].dtype)
+                        self.config.int8_calibrator.set_image_batcher(
+                            ImageBatcher(calib_input, calib_shape, calib_dtype,
+                                         max_num_images=calib_num_images,
+                                         exact_batches=True))
 
         engine_bytes = None
         try:
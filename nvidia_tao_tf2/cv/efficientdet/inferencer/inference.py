@@ -137,6 +137,32 @@ def build_inputs(image_path_pattern: Text, image_size: Union[int, Tuple[int, int
     return raw_images, fnames
 
 
+def build_image_dataset(image_paths, image_size: Union[int, Tuple[int, int]], batch_size: int):
+    """Build a tf.data pipeline that decodes and preprocesses images in parallel.
+
+    Args:
+        image_paths: a list of image paths.
+        image_size: single integer of image size for square image or tuple of two
+            integers, in the format of (image_height, image_width).
+        batch_size: batch size.
+
+    Returns:
+        A dataset of (raw_images, images, scales, fnames) batches, where raw_images
+        is a ragged batch of the decoded images in their original size.
+    """
+    def _load(fname):
+        raw_image = tf.io.decode_image(
+            tf.io.read_file(fname), channels=3, expand_animations=False)
+        image, scale = image_preprocess(raw_image, image_size)
+        return raw_image, image, scale, fname
+
+    dataset = tf.data.Dataset.from_tensor_slices(tf.constant(image_paths, dtype=tf.string))
+    dataset = dataset.map(_load, num_parallel_calls=tf.data.AUTOTUNE)
+    dataset = dataset.apply(tf.data.experimental.dense_to_ragged_batch(batch_size))
+    dataset = dataset.prefetch(tf.data.AUTOTUNE)
+    return dataset
+
+
 def det_post_process_combined(params, cls_outputs, box_outputs, scales,
                               min_score_thresh, max_boxes_to_draw):
     """A combined version of det_post_process with dynamic batch size support."""
@@ -318,12 +344,21 @@ class InferenceModel(tf.Module):
         self.label_id_mapping = label_id_mapping or {}
         self.min_score_thresh = min_score_thresh
         self.max_boxes_to_draw = max_boxes_to_draw
+        self._infer_fn = None
+        self._jit_compile = False
 
     def infer(self, imgs):
         """Run inference on a batch of images."""
         images, scales = batch_image_preprocess(imgs, self.input_shape, self.batch_size)
+        return self.infer_preprocessed(images, scales)
+
+    def infer_preprocessed(self, images, scales):
+        """Run inference on a batch of preprocessed images."""
         cls_outputs, box_outputs = self.model(images, training=False)
+        return self._post_process(cls_outputs, box_outputs, scales)
 
+    def _post_process(self, cls_outputs, box_outputs, scales):
+        """Decode boxes and run NMS."""
         detections = det_post_process_combined(
             self.params,
             cls_outputs, box_outputs,
@@ -332,25 +367,61 @@ class InferenceModel(tf.Module):
             max_boxes_to_draw=self.max_boxes_to_draw)
         return detections
 
-    def visualize_detections(self, image_paths, output_dir, dump_label=False, **kwargs):
-        """Visualize detections."""
+    def _build_infer_fn(self, jit_compile):
+        """Trace inference into one graph, compiling the forward pass with XLA if requested.
+
+        NMS has no XLA kernel, so only the model forward pass is compiled.
+        """
+        forward = tf.function(functools.partial(self.model, training=False),
+                              jit_compile=jit_compile)
+
+        @tf.function
+        def _infer(images, scales):
+            cls_outputs, box_outputs = forward(images)
+            return self._post_process(cls_outputs, box_outputs, scales)
+
+        self._infer_fn = _infer
+        self._jit_compile = jit_compile
+
+    def compiled_infer(self, images, scales):
+        """Run `infer_preprocessed` as a graph function, falling back to no XLA if it fails to compile."""
+        if self._infer_fn is None:
+            self._build_infer_fn(jit_compile=True)
+        try:
+            return self._infer_fn(images, scales)
+        except (tf.errors.InvalidArgumentError, tf.errors.UnimplementedError) as e:
+            if not self._jit_compile:
+                raise
+            logging.warning('XLA compilation failed, running inference without XLA: %s', e)
+            self._build_infer_fn(jit_compile=False)
+            return self._infer_fn(images, scales)
+
+    def visualize_detections(self, batch, output_dir, dump_label=False, **kwargs):
+        """Visualize detections.
+
+        Args:
+            batch: a (raw_images, images, scales, fnames) batch from `build_image_dataset`.
+            output_dir: directory to write annotated images to.
+            dump_label: whether to write KITTI labels.
+        """
         # TODO(@yuw): to use vis_utils function.
-        raw_images, fnames = build_inputs(image_paths, self.input_shape)
-        self.batch_size = min(len(raw_images), self.batch_size)
-        if self.batch_size < 1:
-            return
+        raw_images, images, scales, fnames = batch
         # run inference and render annotations
-        predictions = np.array(self.infer(raw_images))
+        predictions = self.compiled_infer(images, scales).numpy()
         for i, prediction in enumerate(predictions):
+            raw_image = raw_images[i]
+            if isinstance(raw_image, tf.RaggedTensor):
+                raw_image = raw_image.to_tensor()
+            fname = fnames[i].numpy().decode()
             img = visualize_image_prediction(
-                raw_images[i],
+                raw_image.numpy(),
                 prediction,
                 disable_pyfun=self.disable_pyfun,
                 label_id_mapping=self.label_id_mapping,
                 min_score_thresh=self.min_score_thresh,
                 max_boxes_to_draw=self.max_boxes_to_draw,
                 **kwargs)
-            output_image_path = os.path.join(output_dir, os.path.basename(fnames[i]))
+            output_image_path = os.path.join(output_dir, os.path.basename(fname))
             Image.fromarray(img).save(output_image_path)
             logging.info('writing output image to %s', output_image_path)
             if dump_label:
@@ -365,6 +436,15 @@ class InferenceModel(tf.Module):
                         kitti_txt += self.label_id_mapping[int(d[6])] + ' 0 0 0 ' + ' '.join(
                             [str(i) for i in [d[2], d[1], d[4], d[3]]]) + ' 0 0 0 0 0 0 0 ' + \
                             str(d[5]) + '\n'
-                basename = os.path.splitext(os.path.basename(fnames[i]))[0]
+                basename = os.path.splitext(os.path.basename(fname))[0]
                 with open(os.path.join(out_label_path, f"{basename}.txt"), "w", encoding='utf-8') as f:
                     f.write(kitti_txt)
+
+    def visualize_detections_dataset(self, dataset, output_dir, dump_label=False, **kwargs):
+        """Run inference over a dataset from `build_image_dataset` and visualize detections.
+
+        The dataset is iterated in a single pass, so image decoding of the next
+        batch overlaps with inference on the current one.
+        """
+        for batch in dataset:
+            self.visualize_detections(batch, output_dir, dump_label, **kwargs)
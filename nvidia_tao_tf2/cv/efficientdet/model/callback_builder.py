@@ -27,8 +27,7 @@ def get_callbacks(hparams, eval_dataset, steps_per_epoch,
         callbacks.append(tb_callback)
         # set up checkpointing callbacks
         ckpt_dir = hparams['results_dir']  # no longer in `weights` dir
-        if not os.path.exists(ckpt_dir):
-            os.makedirs(ckpt_dir, exist_ok=True)
+        os.makedirs(ckpt_dir, exist_ok=True)
         if hparams['moving_average_decay'] > 0:
             ckpt_callback = EffEmaCheckpoint(
                 eff_dir=ckpt_dir,
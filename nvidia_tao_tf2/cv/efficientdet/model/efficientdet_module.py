@@ -27,7 +27,8 @@ from nvidia_tao_tf2.cv.efficientdet.losses import losses
 from nvidia_tao_tf2.cv.efficientdet.model.efficientdet import efficientdet
 from nvidia_tao_tf2.cv.efficientdet.model import optimizer_builder
 from nvidia_tao_tf2.cv.efficientdet.utils import keras_utils
-from nvidia_tao_tf2.cv.efficientdet.utils.helper import decode_eff, dump_json, load_model, load_json_model
+from nvidia_tao_tf2.cv.efficientdet.utils.helper import (
+    decode_eff, dump_json, load_model, load_json_model)
 from nvidia_tao_tf2.cv.efficientdet.utils.horovod_utils import is_main_process, get_world_size
 logger = logging.getLogger(__name__)
 
@@ -38,12 +39,12 @@ class EfficientDetModule(TAOModule):
     def __init__(self, hparams):
         """Init."""
         self.hparams = hparams
+        world_size = get_world_size()
+        global_batch_size = hparams.train_batch_size * world_size
         self.steps_per_epoch = (
-            hparams.num_examples_per_epoch +
-            (hparams.train_batch_size * get_world_size()) - 1) // \
-            (hparams.train_batch_size * get_world_size())
+            hparams.num_examples_per_epoch + global_batch_size - 1) // global_batch_size
 
-        num_samples = (hparams.eval_samples + get_world_size() - 1) // get_world_size()
+        num_samples = (hparams.eval_samples + world_size - 1) // world_size
         self.num_samples = (num_samples + hparams.eval_batch_size - 1) // hparams.eval_batch_size
         self.hparams.eval_samples = self.num_samples
 
@@ -56,6 +57,10 @@ class EfficientDetModule(TAOModule):
 
         self.model, self.eval_model = self._build_models(hparams)
         self._load_pretrained_weights(hparams)
+        if get_world_size() > 1:
+            # Only rank 0 reads the pretrained weights; hand them to the other
+            # ranks now instead of after their first training step.
+            hvd.broadcast_variables(self.model.variables, root_rank=0)
         self.configure_optimizers(hparams, self.steps_per_epoch)
         self.configure_losses(hparams)
         if hparams.qat:
@@ -92,9 +97,10 @@ class EfficientDetModule(TAOModule):
             eval_model = load_model(hparams.pruned_model_path, hparams, mode='eval')
             tf.keras.backend.set_learning_phase(original_learning_phase)
 
-        # save nonQAT nonAMP graph in results_dir
-        dump_json(model, os.path.join(hparams.results_dir, 'train_graph.json'))
-        dump_json(eval_model, os.path.join(hparams.results_dir, 'eval_graph.json'))
+        # save nonQAT nonAMP graph in results_dir; only rank 0 writes checkpoints
+        if is_main_process():
+            dump_json(model, os.path.join(hparams.results_dir, 'train_graph.json'))
+            dump_json(eval_model, os.path.join(hparams.results_dir, 'eval_graph.json'))
         return model, eval_model
 
     def _resume(self, hparams, steps_per_epoch):
@@ -134,19 +140,21 @@ class EfficientDetModule(TAOModule):
                     else:
                         logger.info("Loading EfficientNet backbone...")
                         pretrained_model = tf.keras.models.load_model(ckpt_path)
+                    target_layers = {layer.name: layer for layer in self.model.layers}
                     for layer in pretrained_model.layers[1:]:
                         # The layer must match up to prediction layers.
-                        l_return = None
-                        try:
-                            l_return = self.model.get_layer(layer.name)
-                        except ValueError:
+                        l_return = target_layers.get(layer.name)
+                        if l_return is None:
                             # Some layers are not there
                             logger.info("Skipping %s, as it does not exist in the training model.", layer.name)
-                        if l_return is not None:
-                            try:
-                                l_return.set_weights(layer.get_weights())
-                            except ValueError:
-                                logger.info("Skipping %s, due to shape mismatch.", layer.name)
+                            continue
+                        if len(l_return.weights) != len(layer.weights) or any(
+                                w.shape != pw.shape for w, pw in zip(l_return.weights, layer.weights)):
+                            logger.info("Skipping %s, due to shape mismatch.", layer.name)
+                            continue
+                        # Assign variable to variable so the values stay on device.
+                        for dst, src in zip(l_return.weights, layer.weights):
+                            dst.assign(src)
 
     def configure_losses(self, hparams, loss=None):
         """Configure losses."""
@@ -182,9 +190,11 @@ class EfficientDetModule(TAOModule):
 
     def compile(self):
         """Compile model."""
+        # XLA is scoped to the compiled train/test steps, not auto-jit on every op.
         self.model.compile(
             optimizer=self.optimizers,
-            loss=self.losses)
+            loss=self.losses,
+            jit_compile=self.hparams.get('use_xla', False))
         self.model.train_step = self.train_step
         self.model.test_step = self.test_step
 
@@ -21,6 +21,12 @@ def to_list(inputs):
     raise ValueError(f'Unrecognized inputs : {inputs}')
 
 
+def transform_detections(detections):
+    """Transform detections from [id, x1, y1, x2, y2, score, class] to [id, x, y, w, h, score, class]."""
+    wh = detections[..., 3:5] - detections[..., 1:3]
+    return tf.concat([detections[..., 0:3], wh, detections[..., 5:7]], axis=-1)
+
+
 class EfficientDetPostprocessor(Postprocessor):
     """EfficientDet Postprocessor."""
 
@@ -309,8 +309,7 @@ def _create_tf_record_from_coco_annotations(object_annotations_file,
 def run_conversion(cfg):
     """Run data conversion."""
     # config output files
-    if not os.path.exists(cfg.results_dir):
-        os.makedirs(cfg.results_dir, exist_ok=True)
+    os.makedirs(cfg.results_dir, exist_ok=True)
     tag = cfg.dataset_convert.tag or os.path.splitext(os.path.basename(cfg.dataset_convert.annotations_file))[0]
     output_path = os.path.join(cfg.results_dir, tag)
 
@@ -27,7 +27,7 @@ import nvidia_tao_tf2.common.no_warning # noqa pylint: disable=W0611
 from nvidia_tao_tf2.common.utils import update_results_dir
 
 from nvidia_tao_tf2.cv.efficientdet.dataloader import dataloader, datasource
-from nvidia_tao_tf2.cv.efficientdet.processor.postprocessor import EfficientDetPostprocessor
+from nvidia_tao_tf2.cv.efficientdet.processor.postprocessor import EfficientDetPostprocessor, transform_detections
 from nvidia_tao_tf2.cv.efficientdet.utils import coco_metric, label_utils
 from nvidia_tao_tf2.cv.efficientdet.utils import helper, hparams_config
 from nvidia_tao_tf2.cv.efficientdet.utils.config_utils import generate_params_from_cfg
@@ -57,7 +57,9 @@ def run_experiment(cfg):
     eval_dl = dataloader.CocoDataset(
         eval_sources,
         is_training=False,
-        max_instances_per_image=config.max_instances_per_image)
+        max_instances_per_image=config.max_instances_per_image,
+        num_shards=get_world_size(),
+        shard_index=get_rank())
     eval_dataset = eval_dl(
         config.as_dict(),
         batch_size=cfg.evaluate.batch_size)
@@ -65,7 +67,7 @@ def run_experiment(cfg):
     num_samples = (cfg.evaluate.num_samples + get_world_size() - 1) // get_world_size()
     num_samples = (num_samples + cfg.evaluate.batch_size - 1) // cfg.evaluate.batch_size
     cfg.evaluate.num_samples = num_samples
-    eval_dataset = eval_dataset.shard(get_world_size(), get_rank()).take(num_samples)
+    eval_dataset = eval_dataset.take(num_samples)
 
     # Load model from graph json
     model = helper.load_model(cfg.evaluate.checkpoint, cfg, MODE, is_qat=cfg.train.qat)
@@ -83,19 +85,6 @@ def run_experiment(cfg):
             labels['image_scales'],
             labels['source_ids'])
 
-        def transform_detections(detections):
-            # A transforms detections in [id, x1, y1, x2, y2, score, class]
-            # form to [id, x, y, w, h, score, class]."""
-            return tf.stack([
-                detections[:, :, 0],
-                detections[:, :, 1],
-                detections[:, :, 2],
-                detections[:, :, 3] - detections[:, :, 1],
-                detections[:, :, 4] - detections[:, :, 2],
-                detections[:, :, 5],
-                detections[:, :, 6],
-            ], axis=-1)
-
         tf.numpy_function(
             evaluator.update_state,
             [labels['groundtruth_data'], transform_detections(detections)], [])
@@ -57,7 +57,6 @@ def run_export(cfg):
 
     assert cfg.export.onnx_file.endswith('.onnx'), "Exported file must end with .onnx"
     output_dir = tempfile.mkdtemp()
-    tf.keras.backend.set_learning_phase(0)
 
     # Load model from graph json
     model = helper.load_model(cfg.export.checkpoint, cfg, MODE, is_qat=cfg.train.qat)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 """EfficientDet standalone inference."""
+import functools
 import logging
 import os
 import sys
@@ -33,28 +34,33 @@ from nvidia_tao_tf2.cv.efficientdet.utils.horovod_utils import initialize
 deprecation._PRINT_DEPRECATION_WARNINGS = False
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # or any {'0', '1', '2'}
 os.environ["TF_CPP_VMODULE"] = 'non_max_suppression_op=0,generate_box_proposals_op=0,executor=0'
-supported_img_format = ['.jpg', '.jpeg', '.JPG', '.JPEG', '.png', '.PNG']
+SUPPORTED_IMG_FORMAT = ('.jpg', '.jpeg', '.png')
 logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level='INFO')
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=4)
+def _load_label_dict(label_txt, mtime):  # noqa pylint: disable=W0613
+    """Parse a label txt file. `mtime` invalidates the cache when the file changes."""
+    with open(label_txt, 'r', encoding='utf-8') as f:
+        return {i + 1: label.rstrip('\n') for i, label in enumerate(f)}
+
+
 def get_label_dict(label_txt):
     """Create label dict from txt file."""
-    with open(label_txt, 'r', encoding='utf-8') as f:
-        labels = f.readlines()
-        return {i + 1: label[:-1] for i, label in enumerate(labels)}
+    return _load_label_dict(label_txt, os.path.getmtime(label_txt))
 
 
-def batch_generator(iterable, batch_size=1):
-    """Load a list of image paths in batches.
+def list_images(image_dir):
+    """List supported images in a directory, sorted by name.
 
     Args:
-        iterable: a list of image paths
-        n: batch size
+        image_dir: path to the image directory
     """
-    total_len = len(iterable)
-    for ndx in range(0, total_len, batch_size):
-        yield iterable[ndx:min(ndx + batch_size, total_len)]
+    with os.scandir(image_dir) as it:
+        return sorted(
+            e.path for e in it
+            if e.is_file() and e.name.lower().endswith(SUPPORTED_IMG_FORMAT))
 
 
 @monitor_status(name='efficientdet', mode='inference')
@@ -90,17 +96,16 @@ def infer_tlt(cfg):
                                            label_id_mapping=label_id_mapping,
                                            min_score_thresh=cfg.inference.min_score_thresh,
                                            max_boxes_to_draw=cfg.inference.max_boxes_to_draw)
-    imgpath_list = [os.path.join(cfg.inference.image_dir, imgname)
-                    for imgname in sorted(os.listdir(cfg.inference.image_dir))
-                    if os.path.splitext(imgname)[1].lower()
-                    in supported_img_format]
+    imgpath_list = list_images(cfg.inference.image_dir)
+
+    dataset = inference.build_image_dataset(
+        imgpath_list, config.image_size, cfg.inference.batch_size)
 
     logger.info("Running inference...")
-    for image_paths in batch_generator(imgpath_list, cfg.inference.batch_size):
-        infer_model.visualize_detections(
-            image_paths,
-            cfg.inference.results_dir,
-            cfg.inference.dump_label)
+    infer_model.visualize_detections_dataset(
+        dataset,
+        cfg.inference.results_dir,
+        cfg.inference.dump_label)
 
 
 spec_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,6 +16,8 @@ import logging
 import os
 import sys
 
+import tensorflow as tf
+
 from nvidia_tao_core.config.efficientdet_tf2.default_config import ExperimentConfig
 
 from nvidia_tao_tf2.common.decorators import monitor_status
@@ -34,6 +36,8 @@ from nvidia_tao_tf2.cv.efficientdet.utils.horovod_utils import is_main_process,
 from nvidia_tao_tf2.cv.efficientdet.utils.horovod_utils import get_world_size, get_rank
 logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level='INFO')
 logger = logging.getLogger(__name__)
+# Largest per-rank evaluation subset (in bytes of parsed images) kept in host memory.
+EVAL_CACHE_MAX_BYTES = 2 * 1024 ** 3
 
 
 @monitor_status(name='efficientdet', mode='training')
@@ -52,6 +56,7 @@ def run_experiment(cfg):
         init_mlops(cfg, name='efficientdet')
 
     # Set up dataloader
+    params = config.as_dict()
     train_sources = datasource.DataSource(
         cfg.dataset.train_tfrecords,
         cfg.dataset.train_dirs)
@@ -61,7 +66,7 @@ def run_experiment(cfg):
         use_fake_data=cfg.dataset.use_fake_data,
         max_instances_per_image=config.max_instances_per_image)
     train_dataset = train_dl(
-        config.as_dict(),
+        params,
         batch_size=cfg.train.batch_size)
     # eval data
     eval_sources = datasource.DataSource(
@@ -70,16 +75,30 @@ def run_experiment(cfg):
     eval_dl = dataloader.CocoDataset(
         eval_sources,
         is_training=False,
-        max_instances_per_image=config.max_instances_per_image)
+        max_instances_per_image=config.max_instances_per_image,
+        num_shards=get_world_size(),
+        shard_index=get_rank())
     eval_dataset = eval_dl(
-        config.as_dict(),
+        params,
         batch_size=cfg.evaluate.batch_size)
 
     efficientdet = EfficientDetModule(config)
+    # config.eval_samples is now the number of eval batches per rank.
+    # The eval subset is parsed the same way every epoch, so cache it when small.
+    eval_subset = eval_dataset.take(config.eval_samples)
+    height, width = config.image_size
+    if config.eval_samples * cfg.evaluate.batch_size * height * width * 3 * 4 <= EVAL_CACHE_MAX_BYTES:
+        eval_subset = eval_subset.cache()
+    # Each rank only sees its local GPU, so copy the next batches to it ahead of time.
+    if tf.config.list_logical_devices('GPU'):
+        eval_subset = eval_subset.apply(
+            tf.data.experimental.prefetch_to_device('/gpu:0', buffer_size=2))
+    else:
+        eval_subset = eval_subset.prefetch(tf.data.AUTOTUNE)
     # set up callbacks
     callbacks = callback_builder.get_callbacks(
         config,
-        eval_dataset.shard(get_world_size(), get_rank()).take(config.eval_samples),
+        eval_subset,
         efficientdet.steps_per_epoch,
         eval_model=efficientdet.eval_model,
         initial_epoch=efficientdet.initial_epoch)
@@ -89,7 +108,7 @@ def run_experiment(cfg):
     trainer.fit(
         efficientdet,
         train_dataset,
-        eval_dataset,
+        eval_subset,
         verbose=1 if is_main_process() else 0)
 
 
@@ -0,0 +1,153 @@
+# Copyright (c) 2023, NVIDIA CORPORATION.  All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""EfficientDet hparams config tests."""
+
+import ast
+import os
+import pytest
+
+from nvidia_tao_tf2.cv.efficientdet.utils import hparams_config
+
+
+def _write(path, text, mtime_ns):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_parse_from_yaml_cache_key(tmpdir):
+    path = os.path.join(str(tmpdir), 'spec.yaml')
+    config = hparams_config.Config()
+    _write(path, 'lr: 1\n', 10**18)
+    assert config.parse_from_yaml(path) == {'lr': 1}
+    # The result is a copy; mutating it leaves the cached dict intact.
+    config.parse_from_yaml(path)['lr'] = 5
+    assert config.parse_from_yaml(path) == {'lr': 1}
+    # Same size, new mtime.
+    _write(path, 'lr: 2\n', 2 * 10**18)
+    assert config.parse_from_yaml(path) == {'lr': 2}
+    # Same mtime, new size.
+    _write(path, 'lr: 30\n', 2 * 10**18)
+    assert config.parse_from_yaml(path) == {'lr': 30}
+    # Known limitation: same size and same mtime is served from the cache.
+    _write(path, 'lr: 40\n', 2 * 10**18)
+    assert config.parse_from_yaml(path) == {'lr': 30}
+
+
+def test_save_to_yaml_evicts_cache(tmpdir):
+    path = os.path.join(str(tmpdir), 'spec.yaml')
+    _write(path, 'lr: 1\n', 10**18)
+    assert hparams_config.Config().parse_from_yaml(path) == {'lr': 1}
+    hparams_config.Config({'lr': 2}).save_to_yaml(path)
+    os.utime(path, ns=(10**18, 10**18))
+    assert hparams_config.Config().parse_from_yaml(path) == {'lr': 2}
+
+
+def test_parse_from_str_nested_keys_and_arrays():
+    config_dict = hparams_config.Config().parse_from_str(
+        'a.b.c=1,a.d=2*3.5*x,e=true,,a.b.f=none, g =7')
+    assert config_dict == {
+        'a': {'b': {'c': 1, 'f': 'none'}, 'd': [2, 3.5, 'x']},
+        'e': True,
+        'g': 7,
+    }
+    # A later dotted key replaces an earlier non-dict value.
+    assert hparams_config.Config().parse_from_str('a=1,a.b=2') == {'a': {'b': 2}}
+    assert hparams_config.Config().parse_from_str('') == {}
+
+
+def test_parse_from_str_missing_equal_sign():
+    with pytest.raises(ValueError):
+        hparams_config.Config().parse_from_str('a.b=1,c')
+
+
+def _literal_eval_str(val):
+    """eval_str_fn without the numeric fast paths."""
+    if val in {'true', 'false'}:
+        return val == 'true'
+    try:
+        return ast.literal_eval(val)
+    except (ValueError, SyntaxError):
+        return val
+
+
+@pytest.mark.parametrize(
+    "val",
+    ['0', '7', '-3', '+3', '00', '007', '1_000', '١٢',
+     '1.5', '.5', '1.', '-2.5e-1', '1e3', '1E+3', '1.5.5', 'e', '-', 'inf', 'nan',
+     'true', 'false', 'True', 'None', '(1, 2)', '[1, 2]', '0x10', 'swish', ' 2'])
+def test_eval_str_fn_matches_literal_eval(val):
+    expected = _literal_eval_str(val)
+    result = hparams_config.eval_str_fn(val)
+    assert type(result) is type(expected)  # noqa pylint: disable=C0123
+    assert result == expected
+
+
+def test_override_merges_nested_configs():
+    config = hparams_config.Config({'nms': {'method': 'gaussian', 'sigma': None}, 'lr': 0.1})
+    config.override('nms.sigma=0.5,lr=0.2')
+    config.override({'nms': hparams_config.Config({'method': 'hard'})})
+    assert config.as_dict() == {'nms': {'method': 'hard', 'sigma': 0.5}, 'lr': 0.2}
+    config.update({'nms': {'extra': 1}, 'new': 2})
+    assert config.nms.extra == 1 and config.new == 2
+
+
+@pytest.mark.parametrize(
+    "override",
+    ['nms.typo=1', 'typo=1', {'nms': {'typo': 1}}])
+def test_override_rejects_new_keys(override):
+    config = hparams_config.Config({'nms': {'method': 'gaussian'}, 'lr': 0.1})
+    with pytest.raises(KeyError):
+        config.override(override)
+
+
+def test_to_namedtuple():
+    config = hparams_config.Config({'lr': 0.1, 'ratios': [[1.0, 1.0], [1.4, 0.7]], 'nms': {'sigma': 0.5}})
+    view = config.to_namedtuple()
+    assert view.lr == 0.1
+    assert view.ratios == ((1.0, 1.0), (1.4, 0.7))
+    assert view.nms.sigma == 0.5
+    assert hash(view) == hash(hparams_config.Config(config.as_dict()).to_namedtuple())
+
+
+def test_to_namedtuple_renames_invalid_keys():
+    config = hparams_config.Config(
+        {'class': 1, '_private': 2, 'ok': 3, 'for': {'x': 1}, 'a-b': {'c': 2}, '1st': 4})
+    view = config.to_namedtuple()
+    assert view._fields == ('_0', '_1', 'ok', '_3', '_4', '_5')
+    assert view[:3] == (1, 2, 3) and view[5] == 4
+    assert view[3].x == 1 and view[4].c == 2
+
+
+def test_config_str_tracks_value_types():
+    config = hparams_config.Config({'lr': 1, 'flag': 0})
+    assert str(config) == 'flag: 0\nlr: 1\n'
+    config.lr = 1.0
+    config.flag = False
+    assert str(config) == 'flag: false\nlr: 1.0\n'
+    assert str(config) == str(hparams_config.Config({'lr': 1.0, 'flag': False}))
+
+
+def test_config_str_falls_back_for_unrepresentable_values():
+    config = hparams_config.Config({'lr': object()})
+    assert str(config).startswith("{'lr': <object object")
+
+
+def test_save_to_yaml_round_trips_tuples(tmpdir):
+    path = os.path.join(str(tmpdir), 'spec.yaml')
+    config = hparams_config.get_efficientdet_config('efficientdet-d0')
+    config.save_to_yaml(path)
+    assert hparams_config.Config().parse_from_yaml(path) == config.as_dict()
+    assert hparams_config.Config().parse_from_yaml(path)['aspect_ratios'][0] == (1.0, 1.0)
@@ -31,8 +31,12 @@ from nvidia_tao_tf2.cv.efficientdet.scripts.prune import run_pruning
 
 TMP_MODEL_DIR = '/home/scratch.metropolis2/tao_ci/tao_tf2/models/tmp'
 DATA_DIR = '/home/scratch.metropolis2/tao_ci/tao_tf2/data/coco'
-time_str = datetime.now().strftime("%y_%m_%d_%H:%M:%S")
-hvd.init()
+
+
+@pytest.fixture(scope='session')
+def time_str():
+    hvd.init()
+    return datetime.now().strftime("%y_%m_%d_%H:%M:%S")
 
 
 @pytest.fixture(scope='function')
@@ -57,7 +61,7 @@ def cfg():
 @pytest.mark.train
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs",
                          [(True, False, 2, 2)])
-def test_train(amp, qat, batch_size, num_epochs, cfg):
+def test_train(amp, qat, batch_size, num_epochs, cfg, time_str):
     results_dir = os.path.join(
         TMP_MODEL_DIR,
         f"effdet_b{batch_size}_ep{num_epochs}_{time_str}")
@@ -79,7 +83,7 @@ def test_train(amp, qat, batch_size, num_epochs, cfg):
 @pytest.mark.evaluate
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs",
                          [(True, False, 2, 2)])
-def test_eval(amp, qat, batch_size, num_epochs, cfg):
+def test_eval(amp, qat, batch_size, num_epochs, cfg, time_str):
     # reset graph precision
     policy = tf.keras.mixed_precision.Policy('float32')
     tf.keras.mixed_precision.set_global_policy(policy)
@@ -102,7 +106,7 @@ def test_eval(amp, qat, batch_size, num_epochs, cfg):
 @pytest.mark.export
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type",
                          [(True, False, 2, 2, 1, True, 'int8')])
-def test_export(amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type, cfg):
+def test_export(amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type, cfg, time_str):
     # reset graph precision
     policy = tf.keras.mixed_precision.Policy('float32')
     tf.keras.mixed_precision.set_global_policy(policy)
@@ -131,7 +135,7 @@ def test_export(amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type,
 @pytest.mark.inference
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs",
                          [(True, False, 2, 2)])
-def test_infer(amp, qat, batch_size, num_epochs, cfg):
+def test_infer(amp, qat, batch_size, num_epochs, cfg, time_str):
 
     cfg.train.num_epochs = num_epochs
     cfg.train.amp = amp
@@ -156,7 +160,7 @@ def test_infer(amp, qat, batch_size, num_epochs, cfg):
                           (True, False, 2, 2, 0.7),
                           (True, False, 2, 2, 0.9),
                           (True, False, 2, 2, 2.5),])
-def test_prune(amp, qat, batch_size, num_epochs, threshold, cfg):
+def test_prune(amp, qat, batch_size, num_epochs, threshold, cfg, time_str):
     cfg.prune.threshold = threshold
     cfg.train.num_epochs = num_epochs
     cfg.train.amp = amp
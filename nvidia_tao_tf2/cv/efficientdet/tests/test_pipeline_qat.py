@@ -29,8 +29,12 @@ from nvidia_tao_tf2.cv.efficientdet.scripts.export import run_export
 
 TMP_MODEL_DIR = '/home/scratch.metropolis2/tao_ci/tao_tf2/models/tmp'
 DATA_DIR = '/home/scratch.metropolis2/tao_ci/tao_tf2/data/coco'
-time_str = datetime.now().strftime("%y_%m_%d_%H:%M:%S")
-hvd.init()
+
+
+@pytest.fixture(scope='session')
+def time_str():
+    hvd.init()
+    return datetime.now().strftime("%y_%m_%d_%H:%M:%S")
 
 
 @pytest.fixture(scope='function')
@@ -52,7 +56,7 @@ def cfg():
 
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs",
                          [(False, True, 4, 1)])
-def test_train(amp, qat, batch_size, num_epochs, cfg):
+def test_train(amp, qat, batch_size, num_epochs, cfg, time_str):
     # reset graph precision
     policy = tf.keras.mixed_precision.Policy('float32')
     tf.keras.mixed_precision.set_global_policy(policy)
@@ -79,7 +83,7 @@ def test_train(amp, qat, batch_size, num_epochs, cfg):
 )
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs",
                          [(False, True, 4, 1)])
-def test_eval(amp, qat, batch_size, num_epochs, cfg):
+def test_eval(amp, qat, batch_size, num_epochs, cfg, time_str):
     # reset graph precision
     policy = tf.keras.mixed_precision.Policy('float32')
     tf.keras.mixed_precision.set_global_policy(policy)
@@ -104,7 +108,7 @@ def test_eval(amp, qat, batch_size, num_epochs, cfg):
 )
 @pytest.mark.parametrize("amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type",
                          [(False, True, 4, 1, 1, True, 'int8')])
-def test_export(amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type, cfg):
+def test_export(amp, qat, batch_size, num_epochs, max_bs, dynamic_bs, data_type, cfg, time_str):
     # reset graph precision
     policy = tf.keras.mixed_precision.Policy('float32')
     tf.keras.mixed_precision.set_global_policy(policy)
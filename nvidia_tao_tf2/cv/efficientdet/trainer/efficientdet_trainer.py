@@ -41,7 +41,8 @@ class EfficientDetTrainer(Trainer):
                 initial_epoch=module.initial_epoch,
                 callbacks=self.callbacks,
                 verbose=verbose,
-                validation_data=eval_dataset,
-                validation_steps=module.num_samples)
+                # eval_dataset is already bounded to module.num_samples batches; letting
+                # Keras run it to the end lets a cached eval subset complete its cache.
+                validation_data=eval_dataset)
         else:
             logger.info("Training (%d epochs) has finished.", self.num_epochs)
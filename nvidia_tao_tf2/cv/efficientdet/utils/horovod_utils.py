@@ -21,21 +21,31 @@ import horovod.tensorflow.keras as hvd
 from nvidia_tao_tf2.common.utils import set_random_seed
 logger = logging.getLogger(__name__)
 
+# Filled in on the first successful query; rank and size are fixed after hvd.init().
+_RANK = None
+_WORLD_SIZE = None
+
 
 def get_rank():
     """Get rank."""
-    try:
-        return hvd.rank()
-    except Exception:
-        return 0
+    global _RANK  # noqa pylint: disable=W0603
+    if _RANK is None:
+        try:
+            _RANK = hvd.rank()
+        except Exception:
+            return 0
+    return _RANK
 
 
 def get_world_size():
     """Get world size."""
-    try:
-        return hvd.size()
-    except Exception:
-        return 1
+    global _WORLD_SIZE  # noqa pylint: disable=W0603
+    if _WORLD_SIZE is None:
+        try:
+            _WORLD_SIZE = hvd.size()
+        except Exception:
+            return 1
+    return _WORLD_SIZE
 
 
 def is_main_process():
@@ -43,36 +53,45 @@ def is_main_process():
     return get_rank() == 0
 
 
+def _set_horovod_env():
+    """Set Horovod allreduce tuning knobs, unless the user already has.
+
+    These are only read by hvd.init(), so the world and local sizes come
+    from the MPI launcher instead of hvd.size()/hvd.local_size().
+    """
+    os.environ.setdefault('HOROVOD_FUSION_THRESHOLD', str(64 * 1024 * 1024))
+    os.environ.setdefault('HOROVOD_CYCLE_TIME', '3.5')
+    os.environ.setdefault('HOROVOD_NUM_NCCL_STREAMS', '2')
+    world_size = int(os.environ.get('OMPI_COMM_WORLD_SIZE', '1'))
+    local_size = int(os.environ.get('OMPI_COMM_WORLD_LOCAL_SIZE', str(world_size)))
+    if world_size > local_size:
+        os.environ.setdefault('HOROVOD_HIERARCHICAL_ALLREDUCE', '1')
+
+
 def initialize(cfg, logger, training=True):
     """Initialize training."""
     logger.setLevel(logging.INFO)
+    _set_horovod_env()
     hvd.init()
-    use_xla = False
     if training:
-        os.environ['TF_NUM_INTRAOP_THREADS'] = '1'
-        os.environ['TF_NUM_INTEROP_THREADS'] = str(max(2, (multiprocessing.cpu_count() // hvd.size()) - 2))
-
-    if use_xla:
-        # it turns out tf_xla_enable_lazy_compilation is used before importing tersorflow for the first time,
-        # so setting this flag in the current function would have no effect. Thus, this flag is already
-        # set in Dockerfile. The remaining XLA flags are set here.
-        TF_XLA_FLAGS = os.environ['TF_XLA_FLAGS']  # contains tf_xla_enable_lazy_compilation
-        os.environ['TF_XLA_FLAGS'] = TF_XLA_FLAGS + " --tf_xla_auto_jit=1"
-        os.environ['TF_EXTRA_PTXAS_OPTIONS'] = "-sw200428197=true"
-        tf.keras.backend.clear_session()
-        tf.config.optimizer.set_jit(True)
+        # The runtime is not initialized yet, so these still take effect
+        # (unlike TF_NUM_*_THREADS, which are only read when tensorflow loads).
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+        tf.config.threading.set_inter_op_parallelism_threads(
+            max(2, (multiprocessing.cpu_count() // hvd.size()) - 2))
 
     gpus = tf.config.list_physical_devices('GPU')
-    for gpu in gpus:
-        tf.config.experimental.set_memory_growth(gpu, True)
-        assert tf.config.experimental.get_memory_growth(gpu)
-    tf.config.experimental.set_visible_devices(gpus, 'GPU')
     if gpus:
-        tf.config.experimental.set_visible_devices(gpus[hvd.local_rank()], 'GPU')
+        # Expose only the local GPU so no context is created on the others.
+        local_gpu = gpus[hvd.local_rank()]
+        tf.config.set_visible_devices(local_gpu, 'GPU')
+        tf.config.experimental.set_memory_growth(local_gpu, True)
 
     if training:
         set_random_seed(cfg.train.random_seed + hvd.rank())
 
+    # Use TF32 tensor cores for float32 matmuls/convolutions on Ampere and newer GPUs.
+    tf.config.experimental.enable_tensor_float_32_execution(True)
     if cfg.train.amp and not cfg.train.qat:
         policy = tf.keras.mixed_precision.Policy('mixed_float16')
         tf.keras.mixed_precision.set_global_policy(policy)
@@ -80,5 +99,4 @@ def initialize(cfg, logger, training=True):
         os.environ['TF_ENABLE_AUTO_MIXED_PRECISION'] = '0'
 
     if is_main_process():
-        if not os.path.exists(cfg.results_dir):
-            os.makedirs(cfg.results_dir, exist_ok=True)
+        os.makedirs(cfg.results_dir, exist_ok=True)
@@ -16,16 +16,96 @@
 import ast
 import collections
 import copy
+import functools
+import keyword
+import os
+import sys
 from typing import Any, Dict, Text
-import six
-import tensorflow as tf
 import yaml
 
+try:
+    # libyaml bindings; fall back to the pure-Python classes when unavailable.
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+
+class _ConfigLoader(_Loader):  # pylint: disable=too-many-ancestors
+    """Safe loader that also reads the !!python/tuple tags of saved configs."""
+
+
+class _ConfigDumper(_Dumper):  # pylint: disable=too-many-ancestors
+    """Safe dumper that keeps tuples as !!python/tuple, so saved configs round-trip."""
+
+
+_ConfigLoader.add_constructor(
+    'tag:yaml.org,2002:python/tuple',
+    lambda loader, node: tuple(loader.construct_sequence(node)))
+_ConfigDumper.add_representer(
+    tuple,
+    lambda dumper, data: dumper.represent_sequence('tag:yaml.org,2002:python/tuple', data))
+
+# Parsed YAML files keyed by (path, mtime in ns, size), least recently used first.
+# An outside rewrite that keeps both the size and the mtime (e.g. within the
+# filesystem's timestamp granularity) is not detected; save_to_yaml always evicts.
+_YAML_CACHE = collections.OrderedDict()
+_YAML_CACHE_SIZE = 128
+
+
+_IMMUTABLE = (int, float, bool, str, bytes, type(None))
+
+
+def _gfile():
+    """Import tensorflow on first use; only remote paths need tf.io.gfile."""
+    import tensorflow as tf  # noqa pylint: disable=C0415
+    return tf.io.gfile
+
+
+def _open(path, mode):
+    """Open local files directly; only remote URLs (gs://, hdfs://, ...) need tf.io.gfile."""
+    if '://' in path:
+        return _gfile().GFile(path, mode)
+    return open(path, mode, encoding=None if 'b' in mode else 'utf-8')  # noqa pylint: disable=R1732
+
+
+def _stat(path):
+    """Return (mtime in ns, size in bytes) of a local or remote file."""
+    if '://' in path:
+        stat = _gfile().stat(path)
+        return stat.mtime_nsec, stat.length
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _copy_value(v):
+    """Deep copy a config value, sharing immutable scalars and tuples of them."""
+    if isinstance(v, _IMMUTABLE):
+        return v
+    if isinstance(v, (tuple, list)) and all(isinstance(x, _IMMUTABLE) for x in v):
+        # Flat lists (aspect_ratios, augmix_params, ...) only need a shallow copy.
+        return v if isinstance(v, tuple) else list(v)
+    return copy.deepcopy(v)
+
+
+_MISSING = object()
+_INTERN_MAX_LEN = 64
+_FLOAT_CHARS = frozenset('0123456789.eE+-')
+_FLOAT_MARKS = frozenset('.eE')
+
 
 def eval_str_fn(val):
     """Eval str."""
     if val in {'true', 'false'}:
         return val == 'true'
+    # Plain ints and floats are the common case; skip building an AST for them.
+    digits = val[1:] if val[:1] in ('-', '+') else val
+    if digits.isascii() and digits.isdigit() and (digits[0] != '0' or len(digits) == 1):
+        return int(val)
+    if _FLOAT_CHARS.issuperset(val) and not _FLOAT_MARKS.isdisjoint(val):
+        try:
+            return float(val)
+        except ValueError:
+            pass
     try:
         return ast.literal_eval(val)
     except (ValueError, SyntaxError):
@@ -42,7 +122,13 @@ class Config(object):
 
     def __setattr__(self, k, v):
         """Set attr."""
-        self.__dict__[k] = Config(v) if isinstance(v, dict) else copy.deepcopy(v)
+        # Short names and values ('channels_last', 'swish', ...) repeat across
+        # every Config; intern them so all copies share one string object.
+        if type(k) is str:  # noqa pylint: disable=C0123
+            k = sys.intern(k)
+        if type(v) is str and len(v) < _INTERN_MAX_LEN:  # noqa pylint: disable=C0123
+            v = sys.intern(v)
+        self.__dict__[k] = Config(v) if isinstance(v, dict) else _copy_value(v)
 
     def __getattr__(self, k):
         """Get attr."""
@@ -58,29 +144,40 @@ class Config(object):
 
     def __str__(self):
         """str."""
+        config_dict = self.as_dict()
         try:
-            return yaml.dump(self.as_dict(), indent=4)
-        except TypeError:
-            return str(self.as_dict())
+            return yaml.dump(config_dict, Dumper=_ConfigDumper, indent=4)
+        except (TypeError, yaml.YAMLError):
+            return str(config_dict)
 
     def _update(self, config_dict, allow_new_keys=True):
-        """Recursively update internal members."""
-        if not config_dict:
-            return
-
-        for k, v in six.iteritems(config_dict):
-            if k not in self.__dict__:
-                if allow_new_keys:
-                    self.__setattr__(k, v)  # noqa pylint: disable=C2801
+        """Update internal members, merging nested configs level by level."""
+        # Explicit work stack of (config, updates) instead of one call per nested level.
+        stack = [(self, config_dict)]
+        while stack:
+            target, updates = stack.pop()
+            if not updates:
+                continue
+            members = target.__dict__
+            if allow_new_keys and members.keys().isdisjoint(updates.keys()):
+                # Only new keys, e.g. when filling an empty Config: nothing to merge.
+                for k, v in updates.items():
+                    target.__setattr__(k, v)  # noqa pylint: disable=C2801
+                continue
+
+            for k, v in updates.items():
+                current = members.get(k, _MISSING)
+                if current is _MISSING:
+                    if allow_new_keys:
+                        target.__setattr__(k, v)  # noqa pylint: disable=C2801
+                    else:
+                        raise KeyError(f'Key `{k}` does not exist for overriding.')
+                elif isinstance(current, Config) and isinstance(v, dict):
+                    stack.append((current, v))
+                elif isinstance(current, Config) and isinstance(v, Config):
+                    stack.append((current, v.as_dict()))
                 else:
-                    raise KeyError(f'Key `{k}` does not exist for overriding.')
-            else:
-                if isinstance(self.__dict__[k], Config) and isinstance(v, dict):
-                    self.__dict__[k]._update(v, allow_new_keys)
-                elif isinstance(self.__dict__[k], Config) and isinstance(v, Config):
-                    self.__dict__[k]._update(v.as_dict(), allow_new_keys)
-                else:
-                    self.__setattr__(k, v)  # noqa pylint: disable=C2801
+                    target.__setattr__(k, v)  # noqa pylint: disable=C2801
 
     def get(self, k, default_value=None):
         """Get value."""
@@ -114,48 +211,55 @@ class Config(object):
         self._update(config_dict, allow_new_keys)
 
     def parse_from_yaml(self, yaml_file_path: Text) -> Dict[Any, Any]:
-        """Parses a yaml file and returns a dictionary."""
-        with tf.io.gfile.GFile(yaml_file_path, 'r') as f:
-            config_dict = yaml.load(f, Loader=yaml.FullLoader)
-            return config_dict
+        """Parses a yaml file and returns a dictionary.
+
+        Results are cached by (path, mtime, size), so a file rewritten by
+        another writer with the same size and mtime returns the stale dict.
+        """
+        key = (yaml_file_path, *_stat(yaml_file_path))
+        if key in _YAML_CACHE:
+            _YAML_CACHE.move_to_end(key)
+        else:
+            with _open(yaml_file_path, 'r') as f:
+                _YAML_CACHE[key] = yaml.load(f, Loader=_ConfigLoader)
+            if len(_YAML_CACHE) > _YAML_CACHE_SIZE:
+                _YAML_CACHE.popitem(last=False)
+        # Callers are free to mutate the result.
+        return copy.deepcopy(_YAML_CACHE[key])
 
     def save_to_yaml(self, yaml_file_path):
         """Write a dictionary into a yaml file."""
-        with tf.io.gfile.GFile(yaml_file_path, 'w') as f:
-            yaml.dump(self.as_dict(), f, default_flow_style=False)
+        for key in [key for key in _YAML_CACHE if key[0] == yaml_file_path]:
+            del _YAML_CACHE[key]
+        with _open(yaml_file_path, 'w') as f:
+            yaml.dump(self.as_dict(), f, Dumper=_ConfigDumper, default_flow_style=False)
 
     def parse_from_str(self, config_str: Text) -> Dict[Any, Any]:
         """Parse a string like 'x.y=1,x.z=2' to nested dict {x: {y: 1, z: 2}}."""
         if not config_str:
             return {}
 
-        def add_kv_recursive(k, v):
-            """Recursively parse x.y.z=tt to {x: {y: {z: tt}}}."""
-            if '.' not in k:
-                if '*' in v:
-                    # we reserve * to split arrays.
-                    return {k: [eval_str_fn(vv) for vv in v.split('*')]}
-                return {k: eval_str_fn(v)}
-            pos = k.index('.')
-            return {k[:pos]: add_kv_recursive(k[pos + 1:], v)}
-
-        def merge_dict_recursive(target, src):
-            """Recursively merge two nested dictionary."""
-            for k in src.keys():
-                if ((k in target and isinstance(target[k], dict) and
-                        isinstance(src[k], collections.abc.Mapping))):
-                    merge_dict_recursive(target[k], src[k])
-                else:
-                    target[k] = src[k]
-
         config_dict = {}
         try:
             for kv_pair in config_str.split(','):
                 if not kv_pair:  # skip empty string
                     continue
-                key_str, value_str = kv_pair.split('=')
-                key_str = key_str.strip()
-                merge_dict_recursive(config_dict, add_kv_recursive(key_str, value_str))
+                key_str, sep, value_str = kv_pair.partition('=')
+                if not sep:
+                    raise ValueError(f'Missing "=" in {kv_pair}')
+                # Walk x.y.z down config_dict, creating (or replacing non-dict) nodes.
+                *parents, leaf = key_str.strip().split('.')
+                node = config_dict
+                for part in parents:
+                    child = node.get(part)
+                    if not isinstance(child, dict):
+                        child = node[part] = {}
+                    node = child
+                if '*' in value_str:
+                    # we reserve * to split arrays.
+                    node[leaf] = [eval_str_fn(v) for v in value_str.split('*')]
+                else:
+                    node[leaf] = eval_str_fn(value_str)
             return config_dict
         except ValueError as e:
             raise ValueError(f'Invalid config_str: {config_str}') from e
@@ -163,17 +267,66 @@ class Config(object):
     def as_dict(self):
         """Returns a dict representation."""
         config_dict = {}
-        for k, v in six.iteritems(self.__dict__):
+        for k, v in self.__dict__.items():
             if isinstance(v, Config):
                 config_dict[k] = v.as_dict()
             else:
-                config_dict[k] = copy.deepcopy(v)
+                config_dict[k] = _copy_value(v)
         return config_dict
         # pylint: enable=protected-access
 
+    def to_namedtuple(self, name='Config'):
+        """Returns an immutable, recursively converted namedtuple view.
+
+        Nested Configs become namedtuples and lists become tuples, so a
+        finalized config can be hashed (e.g. as a tf.function argument)
+        when all of its leaves are hashable. Keys that are not valid field
+        names (keywords, leading underscores, ...) become positional
+        fields `_0`, `_1`, ... as with `namedtuple(..., rename=True)`.
+        """
+        fields = tuple(self.__dict__)
+        values = []
+        for i, k in enumerate(fields):
+            v = self.__dict__[k]
+            if isinstance(v, Config):
+                sub_name = f'{name}_{k}'
+                if not sub_name.isidentifier() or keyword.iskeyword(sub_name):
+                    sub_name = f'{name}_{i}'
+                values.append(v.to_namedtuple(sub_name))
+            else:
+                values.append(_to_tuple(v))
+        return _namedtuple_type(name, fields)(*values)
+
+
+def _to_tuple(v):
+    """Recursively convert lists to tuples."""
+    if isinstance(v, (list, tuple)):
+        return tuple(_to_tuple(x) for x in v)
+    return v
+
+
+@functools.lru_cache(maxsize=None)
+def _namedtuple_type(name, fields):
+    """One namedtuple class per (name, fields), so equal configs share a type."""
+    return collections.namedtuple(name, fields, rename=True)
+
+
+def _clone_config(config):
+    """Copy a Config level by level, sharing immutable leaves."""
+    clone = Config()
+    for k, v in config.__dict__.items():
+        clone.__dict__[k] = _clone_config(v) if isinstance(v, Config) else _copy_value(v)
+    return clone
+
 
 def default_detection_configs():
     """Returns a default detection configs."""
+    return _clone_config(_build_default_detection_configs())
+
+
+@functools.lru_cache(maxsize=1)
+def _build_default_detection_configs():
+    """Builds the default detection configs once; callers get clones."""
     h = Config()
 
     # model name.
@@ -415,11 +568,16 @@ efficientdet_model_param_dict = {
 
 def get_efficientdet_config(model_name='efficientdet-d1'):
     """Get the default config for EfficientDet based on model name."""
-    h = default_detection_configs()
-    if model_name in efficientdet_model_param_dict:
-        h.override(efficientdet_model_param_dict[model_name])
-    else:
+    if model_name not in efficientdet_model_param_dict:
         raise ValueError(f'Unknown model name: {model_name}')
+    return _clone_config(_build_efficientdet_config(model_name))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_efficientdet_config(model_name):
+    """Applies the per-model overrides once per model name; callers get clones."""
+    h = _clone_config(_build_default_detection_configs())
+    h.override(efficientdet_model_param_dict[model_name])
     return h
 
 
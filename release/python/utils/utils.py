@@ -17,7 +17,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import glob
 import os
 import setuptools
 
@@ -37,32 +36,42 @@ def up_directory(dir_path, n=1):
 
 TOP_LEVEL_DIR = up_directory(LOCAL_DIR, 3)
 
+PREFIX_DIR = 'ai_infra' + os.sep
+
+
 def remove_prefix(dir_path):
     """Remove a certain prefix from path."""
-    max_path = 8
-    prefix = dir_path
-    while max_path > 0:
-        prefix = os.path.split(prefix)[0]
-        if prefix.endswith('ai_infra'):
-            return dir_path[len(prefix) + 1:]
-        max_path -= 1
+    # The innermost ai_infra directory wins, as when walking up the parents.
+    idx = dir_path.rfind(os.sep + PREFIX_DIR)
+    if idx != -1:
+        return dir_path[idx + len(os.sep + PREFIX_DIR):]
+    if dir_path.startswith(PREFIX_DIR):
+        return dir_path[len(PREFIX_DIR):]
     return dir_path
 
 
+def iter_subdirs(path):
+    """Yield all subdirs of given path as os.walk reaches them."""
+    for dir_path, _, _ in os.walk(path):
+        yield remove_prefix(dir_path)
+
+
 def get_subdirs(path):
     """Get all subdirs of given path."""
-    dirs = os.walk(path)
-    return [remove_prefix(x[0]) for x in dirs]
+    return list(iter_subdirs(path))
 
 
 def rename_py_files(path, ext, new_ext, ignore_files):
     """Rename all .ext files in a path to .new_ext except __init__ files."""
-    files = glob.glob(path + '/*' + ext)
-    for ignore_file in ignore_files:
-        files = [f for f in files if ignore_file not in f]
-
-    for filename in files:
-        os.rename(filename, filename.replace(ext, new_ext))
+    with os.scandir(path) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(ext) or not entry.is_file():
+                continue
+            # Ignore entries may also name directories, so match the full path.
+            if any(ignore_file in entry.path for ignore_file in ignore_files):
+                continue
+            os.rename(entry.path, entry.path[:-len(ext)] + new_ext)
 
 
 def get_version_details():
@@ -79,16 +88,18 @@ def get_version_details():
 
 def cleanup():
     """Cleanup directories after the build process."""
-    req_subdirs = get_subdirs(TOP_LEVEL_DIR)
-    # Cleanup. Rename all .py_tmp files back to .py and delete pyc files
-    for dir_path in req_subdirs:
-        dir_path = os.path.join(TOP_LEVEL_DIR, dir_path)
-        # TODO: @vpraveen Think about removing python files before the final
-        # release.
-        rename_py_files(dir_path, '.py_tmp', '.py', ignore_list)
-        pyc_list = glob.glob(dir_path + '/*.pyc')
-        for pyc_file in pyc_list:
-            os.remove(pyc_file)
+    # Cleanup. Rename all .py_tmp files back to .py and delete pyc files,
+    # in the same walk that lists the directories.
+    # TODO: @vpraveen Think about removing python files before the final
+    # release.
+    for root, _, files in os.walk(TOP_LEVEL_DIR):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if name.endswith('.py_tmp'):
+                if not any(ignore_file in file_path for ignore_file in ignore_list):
+                    os.rename(file_path, file_path[:-len('.py_tmp')] + '.py')
+            elif name.endswith('.pyc'):
+                os.remove(file_path)
 
 
 def find_packages(package_name):